@@ -0,0 +1,112 @@
+import asyncio
+import threading
+
+import pandas as pd
+from sqlalchemy import delete, insert, make_url, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from crud_pagination import PAGE_SIZE
+from db import configure_sqlite, schema_bind
+
+# Async engines of this process per database url, all of them used from _loop
+_engines = {}
+_lock = threading.Lock()
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+def run(coroutine):
+    """Run a coroutine on the process-wide event loop and wait for its result.
+
+    Streamlit scripts are synchronous; pooled aiosqlite connections must stay on the loop that
+    opened them, so every coroutine of the async data layer runs on one loop in its own thread.
+    """
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name='async-data-access', daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coroutine, _loop).result()
+
+
+def get_async_engine(url: str, attached: dict | None = None):
+    """aiosqlite engine of a sqlite:/// url, with the pragmas and attachments of db.get_engine()."""
+    with _lock:
+        engine = _engines.get(url)
+        if engine is None:
+            engine = _engines[url] = create_async_engine(make_url(url).set(drivername='sqlite+aiosqlite'))
+            configure_sqlite(engine.sync_engine, attached)
+        return engine
+
+
+def get_async_sessionmaker(url: str, schema: str | None = None, attached: dict | None = None):
+    return async_sessionmaker(schema_bind(get_async_engine(url, attached), schema), expire_on_commit=False)
+
+
+# Generic Data Access Class, awaitable
+class AsyncDataAccess:
+    @staticmethod
+    async def add_item(session, model, **kwargs):
+        session.add(model(**kwargs))
+        await session.commit()
+
+    @staticmethod
+    async def add_items(session, model, rows):
+        await session.execute(insert(model), rows)
+        await session.commit()
+
+    @staticmethod
+    async def get_item(session, model, item_id):
+        return await session.get(model, item_id)
+
+    @staticmethod
+    async def get_all_items(session, model, options=(), columns=None):
+        if columns is not None:
+            return (await session.execute(select(*columns))).all()
+        return (await session.scalars(select(model).options(*options))).all()
+
+    @staticmethod
+    async def get_page(session, model, after=None, page_size=PAGE_SIZE, statement=None):
+        # Same keyset page as DataAccess.get_page()
+        statement = select(model.__table__) if statement is None else statement
+        if after is not None:
+            statement = statement.where(model.id > after)
+        rows = (await session.execute(statement.order_by(model.id).limit(page_size + 1))).all()
+        frame = pd.DataFrame(rows[:page_size], columns=list(statement.selected_columns.keys()))
+        return frame, rows[page_size - 1].id if len(rows) > page_size else None
+
+    @staticmethod
+    async def get_lookup(session, name_column, id_column) -> dict:
+        return dict((await session.execute(select(name_column, id_column).order_by(name_column))).all())
+
+    @staticmethod
+    async def get_lookups(session_factory, *columns) -> list[dict]:
+        """{name: id} maps of several (name column, id column) pairs, queried concurrently.
+
+        Every query gets its own session, and so its own pooled connection, since one session
+        runs one statement at a time.
+        """
+        async def lookup(name_column, id_column):
+            async with session_factory() as session:
+                return await AsyncDataAccess.get_lookup(session, name_column, id_column)
+
+        return await asyncio.gather(*(lookup(name_column, id_column) for name_column, id_column in columns))
+
+    @staticmethod
+    async def update_item(session, model, item_id, **kwargs):
+        await session.execute(update(model).where(model.id == item_id).values(**kwargs))
+        await session.commit()
+
+    @staticmethod
+    async def update_items(session, model, rows):
+        await session.execute(update(model), rows)
+        await session.commit()
+
+    @staticmethod
+    async def delete_item(session, model, item_id):
+        await session.execute(delete(model).where(model.id == item_id))
+        await session.commit()
+
+    @staticmethod
+    async def delete_items(session, model, item_ids):
+        await session.execute(delete(model).where(model.id.in_(item_ids)))
+        await session.commit()
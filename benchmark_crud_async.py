@@ -0,0 +1,103 @@
+import argparse
+import asyncio
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from async_data_access import AsyncDataAccess, get_async_sessionmaker, run
+from crud_models import CountriesBase, Country, Currency, LongTermInterestRate
+from data_access import DataAccess
+from db import dispose_engines, get_sessionmaker
+
+
+def seed(session_factory, countries: int, years: int) -> None:
+    with session_factory() as session:
+        DataAccess.add_items(session, Country, [{"id": i, "name": f"Country {i:05d}", "code": f"C{i:05d}"}
+                                                for i in range(1, countries + 1)])
+        DataAccess.add_items(session, Currency, [{"country_id": i, "name": f"Currency {i:05d}",
+                                                  "symbol": f"X{i:05d}"} for i in range(1, countries + 1)])
+        DataAccess.add_items(session, LongTermInterestRate,
+                             [{"country_id": i, "year": 1950 + year, "rate": (i + year) % 70 / 10}
+                              for i in range(1, countries + 1) for year in range(years)])
+
+
+def sync_screen(session_factory) -> None:
+    # The lookups and page a country screen needs, one after the other
+    with session_factory() as session:
+        dict(DataAccess.get_all_items(session, Country, columns=(Country.name, Country.id)))
+        dict(DataAccess.get_all_items(session, Currency, columns=(Currency.name, Currency.id)))
+        DataAccess.get_page(session, LongTermInterestRate)
+
+
+async def async_screen(session_factory) -> None:
+    # The same queries, all three at once
+    async def page():
+        async with session_factory() as session:
+            return await AsyncDataAccess.get_page(session, LongTermInterestRate)
+
+    await asyncio.gather(AsyncDataAccess.get_lookups(session_factory, (Country.name, Country.id),
+                                                     (Currency.name, Currency.id)),
+                         page())
+
+
+def measure_sync(session_factory, users: int, screens: int) -> list[float]:
+    def user():
+        latencies = []
+        for _ in range(screens):
+            started = time.perf_counter()
+            sync_screen(session_factory)
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        return [latency for latencies in pool.map(lambda _: user(), range(users)) for latency in latencies]
+
+
+async def measure_async(session_factory, users: int, screens: int) -> list[float]:
+    async def user():
+        latencies = []
+        for _ in range(screens):
+            started = time.perf_counter()
+            await async_screen(session_factory)
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    return [latency for latencies in await asyncio.gather(*(user() for _ in range(users)))
+            for latency in latencies]
+
+
+def report(name: str, latencies: list[float], elapsed: float) -> None:
+    latencies = np.asarray(latencies)
+    print(f"{name:6} {len(latencies) / elapsed:8.1f} screens/s  p50 {np.percentile(latencies, 50) * 1000:8.1f}ms  "
+          f"p95 {np.percentile(latencies, 95) * 1000:8.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the sync and async data access under concurrent sessions.')
+    parser.add_argument('--countries', type=int, default=2_000)
+    parser.add_argument('--years', type=int, default=50)
+    parser.add_argument('--users', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--screens', type=int, default=20, help='Screens rendered per simulated session.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{Path(directory) / 'countries.db3'}"
+        session_factory = get_sessionmaker(url, CountriesBase.metadata)
+        seed(session_factory, args.countries, args.years)
+        async_session_factory = get_async_sessionmaker(url)
+        for users in args.users:
+            print(f"{users} concurrent sessions")
+            started = time.perf_counter()
+            latencies = measure_sync(session_factory, users, args.screens)
+            report('sync', latencies, time.perf_counter() - started)
+            started = time.perf_counter()
+            latencies = run(measure_async(async_session_factory, users, args.screens))
+            report('async', latencies, time.perf_counter() - started)
+        dispose_engines()
+
+
+if __name__ == "__main__":
+    main()
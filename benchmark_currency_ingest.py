@@ -0,0 +1,61 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from currency_store import Base, CurrencyPrice, save_currency_data
+
+# Days per synthetic currency, pandas timestamps only span about 580 years
+DAYS_PER_CURRENCY = 100_000
+
+
+def synthetic_history(rows: int) -> pd.DataFrame:
+    """Frame shaped like Ticker.history() with one row per day."""
+    rng = np.random.default_rng(0)
+    close = 1 + np.cumsum(rng.normal(0, 0.001, rows))
+    index = pd.date_range('1800-01-01', periods=rows, freq='D', tz='Europe/London', name='Date')
+    return pd.DataFrame({'Open': close, 'High': close * 1.001, 'Low': close * 0.999, 'Close': close,
+                         'Volume': np.zeros(rows)}, index=index)
+
+
+def save_with_orm(session, currency: str, data: pd.DataFrame) -> int:
+    # Previous ingestion path, one ORM object per row
+    for index, row in data.iterrows():
+        session.add(CurrencyPrice(currency=currency, date=index, open=row['Open'], high=row['High'],
+                                  low=row['Low'], close=row['Close'], volume=row['Volume']))
+    session.commit()
+    return len(data)
+
+
+def measure(save, rows: int) -> float:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{Path(directory) / 'prices.db'}")
+        Base.metadata.create_all(bind=engine)
+        histories = [synthetic_history(min(DAYS_PER_CURRENCY, rows - start))
+                     for start in range(0, rows, DAYS_PER_CURRENCY)]
+        with sessionmaker(bind=engine)() as session:
+            started = time.perf_counter()
+            for i, data in enumerate(histories):
+                save(session, f'SYN{i}=X', data)
+            elapsed = time.perf_counter() - started
+        engine.dispose()
+    return rows / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure currency price ingestion throughput in rows/s.')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--orm', action='store_true', help='Also measure the per-row ORM path.')
+    args = parser.parse_args()
+    for rows in args.rows:
+        print(f"{rows:>10,} rows  bulk {measure(save_currency_data, rows):>12,.0f} rows/s", end='')
+        print(f"  orm {measure(save_with_orm, rows):>10,.0f} rows/s" if args.orm else '')
+
+
+if __name__ == "__main__":
+    main()
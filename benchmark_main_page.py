@@ -0,0 +1,138 @@
+import argparse
+import json
+import resource
+import subprocess
+import time
+import tracemalloc
+from datetime import date, datetime
+from pathlib import Path
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+import perf
+from data_sources import DEFAULT_RECORDINGS_PATH, ReplaySource, set_data_source
+from market_data_cache import MarketDataCache
+from price_history import clear_price_histories
+from stock import clear_info
+
+RESULTS_PATH = './bench_results'
+SECTIONS = ['General information', 'Price history', 'Balance Sheet', 'Cash Flow', 'Income Statement', 'Estimates']
+
+
+def scenario(tickers: list[str]):
+    """Scripted interactions as (step name, action on the AppTest) pairs, run in order."""
+    steps = [('initial load', lambda at: at)]
+    for ticker in tickers:
+        steps += [('switch ticker', lambda at, ticker=ticker: at.selectbox(key='ticker').select(ticker)),
+                  ('open price history', lambda at: at.radio(key='section').set_value('Price history')),
+                  ('move start date earlier', lambda at: at.date_input(key='start_date').set_value(date(2018, 1, 2))),
+                  ('change moving average', lambda at: at.number_input(key='moving_average').set_value(20)),
+                  ('change moving average again', lambda at: at.number_input(key='moving_average').set_value(50))]
+        steps += [('switch section', lambda at, section=section: at.radio(key='section').set_value(section))
+                  for section in SECTIONS]
+    return steps
+
+
+def run_round(tickers: list[str], trace_memory: bool) -> list[dict]:
+    at = AppTest.from_file('main.py', default_timeout=120)
+    results = []
+    for name, action in scenario(tickers):
+        action(at)
+        perf.reset()
+        if trace_memory:
+            tracemalloc.reset_peak()
+        started = time.perf_counter()
+        at.run()
+        elapsed = time.perf_counter() - started
+        if at.exception:
+            raise RuntimeError(f"Step {name!r} failed: {at.exception[0].message}")
+        results.append({'step': name,
+                        'seconds': elapsed,
+                        'phases': perf.snapshot(),
+                        'traced_peak_bytes': tracemalloc.get_traced_memory()[1] if trace_memory else None})
+    return results
+
+
+def summarize(rounds: list[list[dict]]) -> dict:
+    def stats(values):
+        values = np.asarray(values, dtype=np.float64)
+        return {'p50': float(np.percentile(values, 50)), 'p95': float(np.percentile(values, 95)),
+                'mean': float(values.mean()), 'count': len(values)}
+
+    records = [record for results in rounds for record in results]
+    steps = {}
+    for record in records:
+        steps.setdefault(record['step'], []).append(record['seconds'])
+    phases = {}
+    for record in records:
+        for phase, seconds in record['phases'].items():
+            phases.setdefault(phase, []).append(seconds)
+    traced = [record['traced_peak_bytes'] for record in records if record['traced_peak_bytes'] is not None]
+    return {'rerun': stats([record['seconds'] for record in records]),
+            'steps': {step: stats(values) for step, values in steps.items()},
+            'phases': {phase: stats(values) for phase, values in phases.items()},
+            'memory': {'traced_peak_bytes': max(traced) if traced else None,
+                       'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(previous: dict, current: dict) -> None:
+    print(f"\n{'':32} {'p50 before':>11} {'p50 now':>11} {'p95 before':>11} {'p95 now':>11}")
+    rows = [('rerun', previous['rerun'], current['rerun'])]
+    rows += [(f'step: {step}', previous['steps'].get(step), stats) for step, stats in current['steps'].items()]
+    rows += [(f'phase: {phase}', previous['phases'].get(phase), stats) for phase, stats in current['phases'].items()]
+    for name, before, now in rows:
+        before = before or {'p50': float('nan'), 'p95': float('nan')}
+        print(f"{name[:32]:32} {before['p50'] * 1000:9.1f}ms {now['p50'] * 1000:9.1f}ms "
+              f"{before['p95'] * 1000:9.1f}ms {now['p95'] * 1000:9.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark reruns of main.py against recorded market data.')
+    parser.add_argument('--tickers', nargs='+', default=['AAPL', 'CAT'])
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--recordings', default=DEFAULT_RECORDINGS_PATH)
+    parser.add_argument('--latency', type=float, default=0.2, help='Injected seconds per data request.')
+    parser.add_argument('--jitter', type=float, default=0.05)
+    parser.add_argument('--warm', action='store_true', help='Keep caches between rounds instead of starting cold.')
+    parser.add_argument('--memory', action='store_true', help='Trace peak Python allocations (slower).')
+    parser.add_argument('--output', default=RESULTS_PATH)
+    parser.add_argument('--compare', help='Earlier results file to compare with.')
+    args = parser.parse_args()
+
+    perf.enable()
+    source = ReplaySource(args.recordings, latency=args.latency, jitter=args.jitter)
+    set_data_source(source)
+    if args.memory:
+        tracemalloc.start()
+    rounds = []
+    for i in range(args.rounds):
+        if not args.warm or i == 0:
+            source.cache = MarketDataCache(':memory:')
+            clear_price_histories()
+            clear_info()
+        rounds.append(run_round(args.tickers, args.memory))
+        print(f"Round {i + 1}/{args.rounds}: {sum(record['seconds'] for record in rounds[-1]):.2f}s")
+
+    summary = summarize(rounds)
+    result = {'commit': git_commit(), 'created': datetime.now().isoformat(timespec='seconds'),
+              'parameters': vars(args), 'summary': summary, 'rounds': rounds}
+    output = Path(args.output) / f"main-{result['commit']}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2))
+    print(f"Rerun p50 {summary['rerun']['p50'] * 1000:.1f}ms, p95 {summary['rerun']['p95'] * 1000:.1f}ms, "
+          f"max RSS {summary['memory']['max_rss_kb'] / 1024:.0f} MB, saved to {output}")
+    if args.compare:
+        compare(json.loads(Path(args.compare).read_text())['summary'], summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+from crud_engine import run_app
+
+
+# Streamlit app over every CRUD database, sharing one connection pool
+def main():
+    run_app(title="CRUD Databases")
+
+
+if __name__ == "__main__":
+    main()
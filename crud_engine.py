@@ -0,0 +1,214 @@
+import re
+
+import pandas as pd
+import streamlit as st
+from sqlalchemy import Float, Integer, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
+
+from crud_import import show_bulk_import
+from crud_lookups import pick
+from crud_models import DATABASES, LongTermInterestRate
+from crud_pagination import clear_counts, count_rows, show_page
+from data_access import DataAccess
+from db import get_engine, get_sessionmaker, stats
+from interest_rates import show_time_series
+from sql_profiler import QueryRecorder, slow_queries
+
+# Main database of the shared engine, every CRUD database is attached to each of its connections
+ENGINE_URL = "sqlite:///./databases/crud.db3"
+# Most rows of a parent offered when choosing a row that has no name of its own
+CHILD_LIMIT = 200
+
+
+def get_crud_engine():
+    """The one engine and pool serving all CRUD databases, attached under their schema names."""
+    return get_engine(ENGINE_URL, attached={schema: database.path for schema, database in DATABASES.items()})
+
+
+def get_session_factory(schema: str):
+    get_crud_engine()
+    database = DATABASES[schema]
+    return get_sessionmaker(ENGINE_URL, database.metadata, database.migrations, schema=schema)
+
+
+# Model introspection
+def model_label(model) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", " ", model.__name__)
+
+
+def plural(label: str) -> str:
+    return label[:-1] + "ies" if label.endswith("y") else label + "s"
+
+
+def column_label(column) -> str:
+    return column.name.removesuffix("_id").replace("_", " ").capitalize()
+
+
+def editable_columns(model) -> list:
+    return [column for column in model.__table__.columns if not column.primary_key]
+
+
+def parent_model(model, column):
+    """Model a foreign key column points at, if it has a name to show instead of the id."""
+    for foreign_key in column.foreign_keys:
+        for mapper in model.registry.mappers:
+            if mapper.local_table is foreign_key.column.table and "name" in mapper.local_table.columns:
+                return mapper.class_
+    return None
+
+
+def list_statement(model):
+    """Select of a model's columns for listing, with foreign keys shown as the parent's name."""
+    columns, joins = [], []
+    for column in model.__table__.columns:
+        parent = parent_model(model, column)
+        if parent is None:
+            columns.append(getattr(model, column.key))
+        else:
+            alias = aliased(parent)
+            columns.append(alias.name.label(column.name.removesuffix("_id")))
+            joins.append((alias, getattr(model, column.key) == alias.id))
+    statement = select(*columns).select_from(model)
+    for alias, on in joins:
+        statement = statement.outerjoin(alias, on)
+    return statement
+
+
+# Widgets
+def column_input(session, model, column, value, key: str):
+    """Input widget for a column, prefilled with value, returning the entered value."""
+    label = column_label(column)
+    parent = parent_model(model, column)
+    if parent is not None:
+        return pick(session, f"Select {label}", parent.name, parent.id, key=key, current=value)
+    if isinstance(column.type, Integer):
+        minimum = column.info.get("min_value")
+        return int(st.number_input(label, value=value if value is not None else minimum or 0, step=1,
+                                   min_value=minimum, max_value=column.info.get("max_value"), key=key))
+    if isinstance(column.type, Float):
+        return st.number_input(label, value=float(value or 0.0), key=key)
+    if column.info.get("multiline"):
+        return st.text_area(label, value=value or "", key=key)
+    return st.text_input(label, value=value or "", key=key)
+
+
+def choose_row(session, model, label: str, key: str):
+    """Id of the row chosen by searching its name, or its parent's name and then its other columns."""
+    if "name" in model.__table__.columns:
+        return pick(session, label, model.name, model.id, key=key)
+    for column in editable_columns(model):
+        parent = parent_model(model, column)
+        if parent is not None:
+            parent_id = pick(session, f"Select the {column_label(column)}", parent.name, parent.id,
+                             key=f"{key}_parent")
+            others = [getattr(model, other.key) for other in editable_columns(model) if other is not column]
+            rows = session.execute(select(model.id, *others)
+                                   .where(getattr(model, column.key) == parent_id)
+                                   .order_by(*others)
+                                   .limit(CHILD_LIMIT)).all()
+            choices = {", ".join(f"{other.key}: {value}" for other, value in zip(others, row[1:])): row.id
+                       for row in rows}
+            selected = st.selectbox(label, list(choices), key=key)
+            return choices.get(selected)
+    return int(st.number_input(f"{label} (id)", min_value=1, step=1, key=key))
+
+
+# Screens
+def show_view(session, model, key: str) -> None:
+    statement = list_statement(model)
+    show_page(lambda after: DataAccess.get_page(session, model, after, statement=statement),
+              count_rows(session.get_bind(), model.__table__), f"{key}_pages")
+
+
+def show_create(session, model, key: str) -> None:
+    values = {column.key: column_input(session, model, column, None, f"{key}_create_{column.key}")
+              for column in editable_columns(model)}
+    if st.button(f"Add {model_label(model)}"):
+        try:
+            DataAccess.add_item(session, model, **values)
+        except IntegrityError as e:
+            session.rollback()
+            st.error(f"{model_label(model)} not added, it conflicts with a stored row: {e.orig}")
+        else:
+            clear_counts()
+            st.success(f"{model_label(model)} added successfully")
+
+
+def show_update(session, model, key: str) -> None:
+    row_id = choose_row(session, model, f"Select a {model_label(model)} to Update", f"{key}_update")
+    row = DataAccess.get_item(session, model, row_id) if row_id is not None else None
+    # Keyed by row, so the inputs are prefilled again when another row is chosen
+    values = {column.key: column_input(session, model, column, getattr(row, column.key, None),
+                                       f"{key}_update_{column.key}_{row_id}")
+              for column in editable_columns(model)}
+    if st.button(f"Update {model_label(model)}", disabled=row is None):
+        try:
+            DataAccess.update_item(session, model, row_id, **values)
+        except IntegrityError as e:
+            session.rollback()
+            st.error(f"{model_label(model)} not updated, it conflicts with a stored row: {e.orig}")
+        else:
+            st.success(f"{model_label(model)} updated successfully")
+
+
+def show_delete(session, model, key: str) -> None:
+    row_id = choose_row(session, model, f"Select a {model_label(model)} to Delete", f"{key}_delete")
+    if st.button(f"Delete {model_label(model)}", disabled=row_id is None):
+        DataAccess.delete_item(session, model, row_id)
+        clear_counts()
+        st.success(f"{model_label(model)} deleted successfully")
+
+
+SCREENS = {
+    "View": show_view,
+    "Create": show_create,
+    "Update": show_update,
+    "Delete": show_delete,
+}
+
+# Screens only some models have, by model
+MODEL_SCREENS = {
+    LongTermInterestRate: {"Time Series": show_time_series},
+}
+
+
+# Streamlit app
+def run_app(schemas=None, title: str = "CRUD App using Streamlit and SQLAlchemy") -> None:
+    """Menus and screens for every model of the given databases, all of them by default."""
+    st.title(title)
+    schemas = list(schemas or DATABASES)
+    schema = schemas[0]
+    if len(schemas) > 1:
+        schema = st.sidebar.selectbox("Database", schemas, format_func=lambda schema: DATABASES[schema].title)
+    database = DATABASES[schema]
+    model = st.sidebar.selectbox("Table", database.models, format_func=lambda model: plural(model_label(model)))
+    screens = {**SCREENS, **MODEL_SCREENS.get(model, {})}
+    choice = st.sidebar.selectbox("Menu", [*screens, "Bulk Import"])
+    session_factory = get_session_factory(schema)
+
+    with QueryRecorder(f"{schema}.{model.__tablename__}: {choice}") as recorder:
+        if choice == "Bulk Import":
+            show_bulk_import(session_factory, {plural(model_label(model)): model for model in database.models})
+        else:
+            st.subheader(f"{choice} {plural(model_label(model))}")
+            with session_factory() as session:
+                screens[choice](session, model, f"{schema}_{model.__tablename__}")
+
+    show_debug_panel(recorder)
+
+
+def show_debug_panel(recorder) -> None:
+    """Sidebar panel with the statements of this run, the slow-query log and a JSON export."""
+    summary = recorder.summary()
+    st.sidebar.caption(f"{summary['statements']} database queries in this run, "
+                       f"{summary['db_seconds'] * 1000:.1f}ms, {summary['rows']:,} rows")
+    with st.sidebar.expander("SQL debug"):
+        st.dataframe(pd.DataFrame(recorder.statements, columns=["statement", "seconds", "rows"]),
+                     hide_index=True, use_container_width=True)
+        st.markdown("**Slow queries**")
+        for query in reversed(slow_queries()):
+            st.caption(f"{query['seconds'] * 1000:.1f}ms, {query['database']}")
+            st.code(query["statement"] + "".join(f"\n-- {step}" for step in query["plan"] or []), language="sql")
+        st.download_button("Export JSON", recorder.to_json(), file_name="sql_profile.json", mime="application/json")
+        st.json(stats())
@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+from sqlalchemy import insert
+
+from crud_pagination import clear_counts
+
+# Rows read from the upload and inserted per executemany
+IMPORT_CHUNK_SIZE = 10_000
+
+
+def read_chunks(upload, chunk_size: int = IMPORT_CHUNK_SIZE):
+    """Frames of at most chunk_size rows from a CSV or Parquet file, read one chunk at a time."""
+    if Path(upload.name).suffix.lower() == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(upload).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(upload, chunksize=chunk_size)
+
+
+def import_rows(session, model, chunks, progress=None) -> int:
+    """Insert frames whose columns are model columns in one transaction, one executemany per frame.
+
+    Unknown columns raise ValueError before anything is written. Missing values are stored as
+    NULL. progress(rows) is called after every chunk with the rows inserted so far.
+    """
+    statement = insert(model.__table__)
+    columns = set(model.__table__.columns.keys())
+    rows = 0
+    try:
+        for chunk in chunks:
+            unknown = set(chunk.columns) - columns
+            if unknown:
+                raise ValueError(f"Unknown columns for {model.__tablename__}: {', '.join(sorted(unknown))}")
+            records = chunk.astype(object).where(chunk.notna(), None).to_dict("records")
+            if records:
+                session.execute(statement, records)
+            rows += len(records)
+            if progress is not None:
+                progress(rows)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    clear_counts()
+    return rows
+
+
+def show_bulk_import(session_factory, models: dict) -> None:
+    """Screen to load a CSV or Parquet upload into one of models, given as {label: model}."""
+    st.subheader("Bulk Import")
+    label = st.selectbox("Import into", list(models))
+    model = models[label]
+    st.caption(f"Columns: {', '.join(model.__table__.columns.keys())}. The id column may be left out.")
+    upload = st.file_uploader("CSV or Parquet file", type=["csv", "parquet"])
+
+    if upload is not None and st.button("Import"):
+        bar = st.progress(0.0, text="Importing")
+        with session_factory() as session:
+            try:
+                rows = import_rows(session, model, read_chunks(upload),
+                                   progress=lambda rows: bar.progress(min(upload.tell() / max(upload.size, 1), 1.0),
+                                                                      text=f"{rows:,} rows"))
+            except Exception as e:
+                st.error(f"Import failed, nothing was saved: {e}")
+            else:
+                bar.progress(1.0, text=f"{rows:,} rows")
+                st.success(f"Imported {rows:,} rows into {label}")
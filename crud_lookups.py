@@ -0,0 +1,115 @@
+import threading
+
+import streamlit as st
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from db import database_key
+
+# Most candidates a search picker reads and sends to the browser
+SEARCH_LIMIT = 25
+# Most searches kept per table, the least recently used is dropped first
+SEARCH_CACHE_SIZE = 256
+
+# Search results per (database, table), keyed by (name column, id column, text, limit)
+_searches: dict[tuple[str, str], dict[tuple, dict]] = {}
+# Bumped on every invalidation, so results read while a commit lands are not stored
+_versions: dict[tuple[str, str], int] = {}
+_lock = threading.Lock()
+
+
+def search_lookup(session, name_column, id_column, text: str = "", limit: int = SEARCH_LIMIT) -> dict:
+    """At most limit {name: id} pairs whose name starts with text, case-sensitively.
+
+    The prefix is a range on the name column, name >= text AND name < text + U+10FFFF, which
+    SQLite answers with a seek on the column's index that stops after limit matches, so a search
+    never reads or returns the whole table. A LIKE prefix would scan the whole index. Results are
+    kept for the process until a session commits a change to the table, whether by flushing
+    objects or by an INSERT, UPDATE or DELETE statement.
+    """
+    table = (database_key(session.get_bind()), name_column.class_.__tablename__)
+    search = (name_column.key, id_column.key, text, limit)
+    with _lock:
+        searches = _searches.get(table, {})
+        matches = searches.pop(search, None)
+        if matches is not None:
+            searches[search] = matches
+            return matches
+        version = _versions.get(table, 0)
+    statement = select(name_column, id_column)
+    if text:
+        statement = statement.where(name_column >= text, name_column < text + "\U0010FFFF")
+    matches = dict(session.execute(statement.order_by(name_column).limit(limit)).all())
+    with _lock:
+        if _versions.get(table, 0) == version:
+            searches = _searches.setdefault(table, {})
+            searches[search] = matches
+            if len(searches) > SEARCH_CACHE_SIZE:
+                searches.pop(next(iter(searches)))
+    return matches
+
+
+def pick(session, label: str, name_column, id_column, key: str, current=None):
+    """Search box with a selectbox of the matching names, returns the chosen id or None.
+
+    A text input only reruns the script on Enter or when it loses focus, so searching costs one
+    query per edit of the search text rather than one per keystroke. The row with id current is
+    always offered and selected until another name is chosen, so an untouched form keeps it.
+    """
+    text = st.text_input(f"Search: {label}", key=f"{key}_search", placeholder="Start of the name, case-sensitive")
+    matches = search_lookup(session, name_column, id_column, text.strip())
+    if len(matches) == SEARCH_LIMIT:
+        st.caption(f"Showing the first {SEARCH_LIMIT} matches, type more of the name to narrow them down")
+    index = 0
+    if current is not None:
+        if current not in matches.values():
+            name = session.execute(select(name_column).where(id_column == current)).scalar_one_or_none()
+            if name is not None:
+                matches = {name: current, **matches}
+        index = next((position for position, id_ in enumerate(matches.values()) if id_ == current), 0)
+    selected = st.selectbox(label, list(matches), index=index, key=key)
+    return matches.get(selected)
+
+
+def invalidate(database: str, table_name: str) -> None:
+    with _lock:
+        _searches.pop((database, table_name), None)
+        _versions[(database, table_name)] = _versions.get((database, table_name), 0) + 1
+
+
+def clear_searches() -> None:
+    """Forget all cached search results."""
+    with _lock:
+        for table in _searches:
+            _versions[table] = _versions.get(table, 0) + 1
+        _searches.clear()
+
+
+def _changed(session) -> set:
+    return session.info.setdefault("changed_tables", set())
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flush(session, flush_context):
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        _changed(session).add(instance.__table__.name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_statement(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _changed(orm_execute_state.session).add(orm_execute_state.statement.table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed(session):
+    changed = session.info.pop("changed_tables", set())
+    if changed:
+        database = database_key(session.get_bind())
+        for table_name in changed:
+            invalidate(database, table_name)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed(session):
+    session.info.pop("changed_tables", None)
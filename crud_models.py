@@ -0,0 +1,123 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, Index, delete, func, inspect, select
+from sqlalchemy.orm import declarative_base, relationship
+
+# Every set of models has its own Base, so tables of the same name can live in different databases.
+# Column.info is read by the CRUD screens: multiline strings get a text area, numbers their bounds.
+ItemsBase = declarative_base()
+CatalogBase = declarative_base()
+CountriesBase = declarative_base()
+
+
+# Items
+class Item(ItemsBase):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, index=True)
+    description = Column(String, index=True, info={"multiline": True})
+
+
+# Items and categories
+class Category(CatalogBase):
+    __tablename__ = "categories"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, index=True)
+
+    items = relationship("CatalogItem", back_populates="category")
+
+
+class CatalogItem(CatalogBase):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, index=True)
+    description = Column(String, index=True, info={"multiline": True})
+    category_id = Column(Integer, ForeignKey('categories.id'))
+
+    category = relationship("Category", back_populates="items")
+
+
+# Countries
+class Country(CountriesBase):
+    __tablename__ = "countries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, index=True)
+    code = Column(String, unique=True, index=True)
+
+
+class Currency(CountriesBase):
+    __tablename__ = "currencies"
+
+    id = Column(Integer, primary_key=True, index=True)
+    country_id = Column(Integer, ForeignKey('countries.id'))
+    name = Column(String, unique=True, index=True)
+    symbol = Column(String, unique=True, index=True)
+
+    country = relationship("Country", back_populates="currencies")
+
+
+class LongTermInterestRate(CountriesBase):
+    __tablename__ = "long_term_interest_rates"
+
+    id = Column(Integer, primary_key=True, index=True)
+    country_id = Column(Integer, ForeignKey('countries.id'))
+    year = Column(Integer, info={"min_value": 1900, "max_value": 2100})
+    rate = Column(Float)
+
+    country = relationship("Country", back_populates="interest_rates")
+
+    # One rate per country and year, which also serves a country's series in year order
+    __table_args__ = (Index("ix_long_term_interest_rates_country_year", "country_id", "year", unique=True),)
+
+
+Country.currencies = relationship("Currency", order_by=Currency.id, back_populates="country")
+Country.interest_rates = relationship("LongTermInterestRate", order_by=LongTermInterestRate.id,
+                                      back_populates="country")
+
+
+def migrate_interest_rates(bind) -> None:
+    """Replace the year index by a unique (country_id, year) one, keeping the latest row of each pair.
+
+    Rows without a country or year are left alone; the unique index allows any number of them.
+    """
+    rates = LongTermInterestRate.__table__
+    index = next(index for index in rates.indexes if index.name == "ix_long_term_interest_rates_country_year")
+    schema = (bind.get_execution_options().get("schema_translate_map") or {}).get(None)
+    with bind.begin() as connection:
+        existing = {existing["name"] for existing in inspect(connection).get_indexes(rates.name, schema)}
+        if "ix_long_term_interest_rates_year" in existing:
+            prefix = f'"{schema}".' if schema else ""
+            connection.exec_driver_sql(f"DROP INDEX {prefix}ix_long_term_interest_rates_year")
+        if index.name not in existing:
+            complete = (rates.c.country_id.is_not(None), rates.c.year.is_not(None))
+            latest = select(func.max(rates.c.id)).where(*complete).group_by(rates.c.country_id, rates.c.year)
+            connection.execute(delete(rates).where(*complete, rates.c.id.not_in(latest)))
+            index.create(connection)
+
+
+class CrudDatabase:
+    """A SQLite file of the CRUD apps with the models stored in it, in menu order."""
+
+    def __init__(self, title: str, path: str, models: tuple, migrations=()) -> None:
+        self.title = title
+        self.path = path
+        self.models = models
+        self.metadata = models[0].metadata
+        self.migrations = migrations
+
+    def __repr__(self):
+        return f"CrudDatabase({self.title!r}, {self.path!r})"
+
+
+# Databases by the schema name they are attached as
+DATABASES = {
+    "items": CrudDatabase("Items", "./databases/test.db3", (Item,)),
+    "items_oop": CrudDatabase("Items (OOP)", "./databases/test_oop.db3", (Item,)),
+    "items_oop_sep": CrudDatabase("Items (separated methods)", "./databases/test_oop_sep_meth.db3", (Item,)),
+    "catalog": CrudDatabase("Items and Categories", "./databases/test_oop_sep_rel_meth.db3",
+                            (Category, CatalogItem)),
+    "countries": CrudDatabase("Countries", "./databases/countries.db3", (Country, Currency, LongTermInterestRate),
+                              migrations=(migrate_interest_rates,)),
+}
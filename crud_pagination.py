@@ -0,0 +1,66 @@
+import pandas as pd
+import streamlit as st
+from sqlalchemy import func, select
+
+from db import database_key
+
+# Rows per page of the read screens
+PAGE_SIZE = 50
+# Seconds a table's row count is reused before counting again
+COUNT_TTL = 60
+
+
+def keyset_page(session, statement, key_column, after=None, page_size: int = PAGE_SIZE):
+    """One page of a select ordered by key_column, starting after the key `after`.
+
+    The page is read with WHERE key > after ... LIMIT, a seek on the key's index, so every page
+    costs the same however deep it is. Returns the page as a frame and the key the next page
+    starts after, None on the last page.
+    """
+    if after is not None:
+        statement = statement.where(key_column > after)
+    rows = session.execute(statement.order_by(key_column).limit(page_size + 1)).all()
+    frame = pd.DataFrame(rows[:page_size], columns=list(statement.selected_columns.keys()))
+    next_after = getattr(rows[page_size - 1], key_column.key) if len(rows) > page_size else None
+    return frame, next_after
+
+
+@st.cache_data(ttl=COUNT_TTL, show_spinner=False)
+def _count_rows(_engine, _table, database: str, table_name: str) -> int:
+    with _engine.connect() as connection:
+        return connection.execute(select(func.count()).select_from(_table)).scalar_one()
+
+
+def count_rows(engine, model_table) -> int:
+    """Row count of a table, cached per database and table for COUNT_TTL seconds."""
+    return _count_rows(engine, model_table, database_key(engine), model_table.name)
+
+
+def clear_counts() -> None:
+    """Forget cached row counts, after rows were added or deleted."""
+    _count_rows.clear()
+
+
+def show_page(fetch, total: int, key: str, page_size: int = PAGE_SIZE) -> None:
+    """Render rows one page at a time as a single dataframe with Previous and Next buttons.
+
+    fetch(after) returns a page and the key of the next one, as keyset_page() does. The keys the
+    visited pages start after are stacked in st.session_state[key], so paging back and forth
+    runs one page query per rerun.
+    """
+    pages = st.session_state.setdefault(key, {"starts": [None], "next": None})
+
+    def move(step):
+        if step > 0:
+            pages["starts"].append(pages["next"])
+        else:
+            pages["starts"].pop()
+
+    frame, pages["next"] = fetch(pages["starts"][-1])
+    st.dataframe(frame, hide_index=True, use_container_width=True)
+
+    previous_column, position_column, next_column = st.columns([1, 4, 1])
+    previous_column.button("Previous", key=f"{key}_previous", on_click=move, args=(-1,),
+                           disabled=len(pages["starts"]) == 1)
+    position_column.caption(f"Page {len(pages['starts'])} of {max(1, -(-total // page_size))}, {total:,} rows")
+    next_column.button("Next", key=f"{key}_next", on_click=move, args=(1,), disabled=pages["next"] is None)
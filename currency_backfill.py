@@ -0,0 +1,201 @@
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from queue import Full, Queue
+
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from currency_store import (DATABASE_URL, create_schema, create_store_engine, fetch_currency_data, missing_ranges,
+                            save_currency_data)
+
+BACKFILL_WORKERS = 4
+# Download requests per second across all workers
+BACKFILL_RATE = 2.0
+# Rows the writer collects before committing
+COMMIT_ROWS = 50_000
+# Seconds between checks that the writer is still alive while the queue is full
+PUT_TIMEOUT = 1.0
+
+
+class RateLimiter:
+    """Spaces calls from any number of threads at least 1 / rate seconds apart."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1 / rate
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        time.sleep(start - now)
+
+
+class BackfillJob:
+    """Downloads many currency pairs concurrently and saves them through a single writer thread.
+
+    Each task is (currency, start_date, end_date) and only the dates missing from the database
+    are downloaded. Workers share a rate limiter; the writer upserts what they return and commits
+    every COMMIT_ROWS rows, so SQLite only ever sees one writing connection. If the writer dies,
+    e.g. on "database is locked", the job stops, keeps its error and fails every unsaved pair.
+    """
+
+    def __init__(self, tasks, engine, workers: int = BACKFILL_WORKERS, rate: float = BACKFILL_RATE,
+                 commit_rows: int = COMMIT_ROWS) -> None:
+        self.tasks = list(tasks)
+        self.engine = engine
+        self.workers = workers
+        self.limiter = RateLimiter(rate)
+        self.commit_rows = commit_rows
+        self.downloaded = 0
+        self.saved = 0
+        self.rows = 0
+        self.failed: dict[str, str] = {}
+        self.error: str | None = None
+        self._saved_pairs: set[str] = set()
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self._done = threading.Event()
+
+    def __repr__(self):
+        return f"BackfillJob({len(self.tasks)} pairs, {self.saved} saved, {len(self.failed)} failed)"
+
+    @property
+    def running(self) -> bool:
+        return self.started_at is not None and not self._done.is_set()
+
+    def progress(self) -> dict:
+        elapsed = (self.finished_at or time.time()) - (self.started_at or time.time())
+        finished = self.saved + len(self.failed)
+        return {'pairs': len(self.tasks), 'downloaded': self.downloaded, 'saved': self.saved,
+                'failed': dict(self.failed), 'rows': self.rows, 'seconds': round(elapsed, 1),
+                'fraction': 1.0 if self._done.is_set() else min(finished / max(len(self.tasks), 1), 1.0),
+                'error': self.error, 'done': self._done.is_set()}
+
+    def start(self) -> 'BackfillJob':
+        self.started_at = time.time()
+        threading.Thread(target=self.run, name='currency-backfill', daemon=True).start()
+        return self
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._done.wait(timeout)
+
+    def _download(self, currency: str, start_date, end_date) -> list[pd.DataFrame]:
+        with Session(self.engine) as session:
+            ranges = missing_ranges(session, currency, start_date, end_date)
+        frames = []
+        for missing_start, missing_end in ranges:
+            self.limiter.wait()
+            frames.append(fetch_currency_data(currency, missing_start, missing_end))
+        return [frame for frame in frames if not frame.empty]
+
+    def _write(self, queue: Queue) -> None:
+        # Pairs written since the last commit, kept to be written again if a later pair fails
+        pending, pending_rows = [], 0
+        try:
+            with Session(self.engine) as session:
+                def save(currency, frames) -> int:
+                    return sum(save_currency_data(session, currency, frame, commit=False) for frame in frames)
+
+                def commit() -> None:
+                    nonlocal pending_rows
+                    session.commit()
+                    self.rows += pending_rows
+                    self.saved += len(pending)
+                    self._saved_pairs.update(currency for currency, _ in pending)
+                    pending.clear()
+                    pending_rows = 0
+
+                while (item := queue.get()) is not None:
+                    currency, frames = item
+                    try:
+                        pending_rows += save(currency, frames)
+                        pending.append(item)
+                    except Exception as e:
+                        session.rollback()
+                        self.failed[currency] = repr(e)
+                        pending_rows = sum(save(*written) for written in pending)
+                    if pending_rows >= self.commit_rows or queue.empty():
+                        commit()
+                commit()
+        except Exception as e:
+            self.error = repr(e)
+
+    def _put(self, queue: Queue, writer: threading.Thread, item) -> bool:
+        """Queue item for the writer, False instead of blocking forever once the writer is gone."""
+        while writer.is_alive():
+            try:
+                queue.put(item, timeout=PUT_TIMEOUT)
+                return True
+            except Full:
+                pass
+        return False
+
+    def run(self) -> None:
+        self.started_at = self.started_at or time.time()
+        queue = Queue(maxsize=2 * self.workers)
+        writer = threading.Thread(target=self._write, args=(queue,), name='currency-backfill-writer')
+        writer.start()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='currency-backfill') as pool:
+                futures = {pool.submit(self._download, *task): task[0] for task in self.tasks}
+                for future in as_completed(futures):
+                    currency = futures[future]
+                    try:
+                        frames = future.result()
+                    except Exception as e:
+                        self.failed[currency] = repr(e)
+                        continue
+                    self.downloaded += 1
+                    if not self._put(queue, writer, (currency, frames)):
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        break
+        finally:
+            self._put(queue, writer, None)
+            writer.join()
+            if self.error is not None:
+                for currency, *_ in self.tasks:
+                    if currency not in self._saved_pairs:
+                        self.failed.setdefault(currency, f"not saved, the writer stopped: {self.error}")
+            self.finished_at = time.time()
+            self._done.set()
+
+
+def parse_task(spec: str, start_date, end_date) -> tuple:
+    """Task from PAIR, PAIR:START or PAIR:START:END, defaulting to the given dates."""
+    currency, *dates = spec.strip().split(':')
+    start = pd.to_datetime(dates[0]).date() if len(dates) > 0 and dates[0] else start_date
+    end = pd.to_datetime(dates[1]).date() if len(dates) > 1 and dates[1] else end_date
+    return currency, start, end
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backfill currency prices for many pairs into the database.')
+    parser.add_argument('pairs', nargs='+', help='PAIR, PAIR:START or PAIR:START:END, e.g. EURUSD=X:2010-01-01')
+    parser.add_argument('--start', default='2000-01-01')
+    parser.add_argument('--end', default='today')
+    parser.add_argument('--workers', type=int, default=BACKFILL_WORKERS)
+    parser.add_argument('--rate', type=float, default=BACKFILL_RATE, help='Download requests per second.')
+    parser.add_argument('--database', default=DATABASE_URL)
+    args = parser.parse_args()
+
+    engine = create_store_engine(args.database)
+    create_schema(engine)
+    start_date, end_date = pd.to_datetime(args.start).date(), pd.to_datetime(args.end).date()
+    job = BackfillJob([parse_task(spec, start_date, end_date) for spec in args.pairs], engine,
+                      workers=args.workers, rate=args.rate).start()
+    while not job.wait(timeout=1):
+        progress = job.progress()
+        print(f"{progress['saved']}/{progress['pairs']} pairs saved, {progress['rows']} rows, "
+              f"{len(progress['failed'])} failed, {progress['seconds']}s")
+    print(job.progress())
+    if job.error is not None:
+        raise SystemExit(f"Backfill stopped: {job.error}")
+
+
+if __name__ == "__main__":
+    main()
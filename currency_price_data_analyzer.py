@@ -1,39 +1,23 @@
+import time
+
 import streamlit as st
-from sqlalchemy import create_engine, Column, Integer, String, Float, Date
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session
 import pandas as pd
-import yfinance as yf
-
-# Configure database
-DATABASE_URL = "sqlite:///./currency_prices.db"
-Base = declarative_base()
-
 
-class CurrencyPrice(Base):
-    __tablename__ = "currency_prices"
-    id = Column(Integer, primary_key=True, index=True)
-    currency = Column(String, index=True)
-    date = Column(Date)
-    open = Column(Float)
-    high = Column(Float)
-    low = Column(Float)
-    close = Column(Float)
-    volume = Column(Float)
+from currency_backfill import BACKFILL_WORKERS, BackfillJob, parse_task
+from currency_store import (DATABASE_URL, create_schema, create_store_engine, fetch_currency_data,
+                            load_currency_prices, save_currency_data, sync_currency_data)
 
 
-# Create database
-engine = create_engine(DATABASE_URL)
-Base.metadata.create_all(bind=engine)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-session = SessionLocal()
+# One engine and connection pool per server process, shared by every browser session and rerun
+@st.cache_resource
+def get_engine():
+    engine = create_store_engine(DATABASE_URL)
+    create_schema(engine)
+    return engine
 
 
-# Data pull form yfinance
-def fetch_currency_data(currency_x, start_date, end_date):
-    ticker = yf.Ticker(currency_x)
-    data = ticker.history(start=start_date, end=end_date)
-    return data
+engine = get_engine()
 
 
 st.title('Historical Currency Prices')
@@ -42,42 +26,70 @@ st.title('Historical Currency Prices')
 currency = st.text_input('Enter the currency ticker (e.g., EURUSD=X):', value='EURUSD=X')
 start_date = st.date_input('Start date:', value=pd.to_datetime('2021-01-01'))
 end_date = st.date_input('End date:', value=pd.to_datetime('today'))
+incremental = st.checkbox('Only fetch dates missing from the database', value=True)
 fetch_data = st.button('Fetch and Save Data')
 
-if fetch_data:
+if fetch_data and incremental:
+    started = time.perf_counter()
+    with Session(engine) as session:
+        rows = sync_currency_data(session, currency, start_date, end_date)
+    elapsed = time.perf_counter() - started
+    st.success(f"Data for {currency} from {start_date} to {end_date} is up to date "
+               f"({rows} rows downloaded and saved in {elapsed:.2f}s).")
+elif fetch_data:
     data = fetch_currency_data(currency, start_date, end_date)
     if not data.empty:
-        for index, row in data.iterrows():
-            currency_price = CurrencyPrice(
-                currency=currency,
-                date=index,
-                open=row['Open'],
-                high=row['High'],
-                low=row['Low'],
-                close=row['Close'],
-                volume=row['Volume']
-            )
-            session.add(currency_price)
-        session.commit()
-        st.success(f"Data for {currency} from {start_date} to {end_date} has been saved to the database.")
+        started = time.perf_counter()
+        with Session(engine) as session:
+            rows = save_currency_data(session, currency, data)
+        elapsed = time.perf_counter() - started
+        st.success(f"Data for {currency} from {start_date} to {end_date} has been saved to the database "
+                   f"({rows} rows, {rows / max(elapsed, 1e-9):,.0f} rows/s).")
     else:
         st.warning(f"No data found for {currency}.")
 
 # Show database records
+resample = st.selectbox('Bars:', ['Daily', 'Weekly', 'Monthly'])
 if st.button('Show Data'):
-    currency_prices = session.query(CurrencyPrice).filter(CurrencyPrice.currency == currency).all()
-    if currency_prices:
-        df = pd.DataFrame([{
-            'Date': price.date,
-            'Open': price.open,
-            'High': price.high,
-            'Low': price.low,
-            'Close': price.close,
-            'Volume': price.volume
-        } for price in currency_prices])
+    with engine.connect() as connection:
+        df = load_currency_prices(connection, currency, start_date, end_date,
+                                  resample={'Daily': None, 'Weekly': 'W', 'Monthly': 'M'}[resample])
+    if not df.empty:
+        st.line_chart(df['Close'])
         st.dataframe(df)
     else:
         st.warning(f"No data in the database for {currency}.")
 
-# Session close
-session.close()
\ No newline at end of file
+# Backfill many pairs in the background, the page only polls the job's progress
+st.subheader('Backfill')
+pairs = st.text_area('Currency pairs, one per line (PAIR, PAIR:START or PAIR:START:END):', value='EURUSD=X\nGBPUSD=X')
+workers = st.slider('Parallel downloads:', 1, 16, BACKFILL_WORKERS)
+job = st.session_state.get('backfill_job')
+if st.button('Start backfill', disabled=job is not None and job.running):
+    tasks = [parse_task(spec, start_date, end_date) for spec in pairs.splitlines() if spec.strip()]
+    st.session_state['backfill_job'] = BackfillJob(tasks, engine, workers=workers).start()
+
+
+# Polls only while a job runs, and reruns the page once it is done so the button is enabled again
+job = st.session_state.get('backfill_job')
+polling = job is not None and job.running
+
+
+@st.fragment(run_every=2 if polling else None)
+def show_backfill_progress():
+    job = st.session_state.get('backfill_job')
+    if job is None:
+        return
+    progress = job.progress()
+    st.progress(progress['fraction'],
+                text=f"{progress['saved']}/{progress['pairs']} pairs saved, {len(progress['failed'])} failed, "
+                     f"{progress['rows']} rows in {progress['seconds']}s")
+    if progress['error'] is not None:
+        st.error(f"Backfill stopped: {progress['error']}")
+    for currency, error in progress['failed'].items():
+        st.error(f"{currency}: {error}")
+    if polling and progress['done']:
+        st.rerun()
+
+
+show_backfill_progress()
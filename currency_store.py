@@ -0,0 +1,180 @@
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Column, Integer, String, Float, Date, Index, func, inspect, select, text
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import declarative_base
+
+from data_sources import get_data_source
+from db import get_engine
+
+# Configure database
+DATABASE_URL = "sqlite:///./currency_prices.db"
+Base = declarative_base()
+
+# Rows per executemany batch when saving prices
+BULK_BATCH_SIZE = 10_000
+# Longest run of business days without prices taken for market holidays rather than missing data
+HOLIDAY_GAP_DAYS = 3
+
+
+class CurrencyPrice(Base):
+    __tablename__ = "currency_prices"
+    id = Column(Integer, primary_key=True, index=True)
+    # Looked up through the (currency, date) index below
+    currency = Column(String)
+    date = Column(Date)
+    open = Column(Float)
+    high = Column(Float)
+    low = Column(Float)
+    close = Column(Float)
+    volume = Column(Float)
+
+    # One row per currency and day, the key that saving upserts on and reads scan by date range
+    __table_args__ = (Index('ix_currency_prices_currency_date', 'currency', 'date', unique=True),)
+
+
+def create_store_engine(url: str = DATABASE_URL):
+    """Engine of the price database from the process-wide registry, with its SQLite pragmas."""
+    return get_engine(url)
+
+
+def create_schema(engine) -> None:
+    Base.metadata.create_all(bind=engine)
+    # Tables created before the unique key may hold duplicates, keep the first copy of each row
+    index = next(index for index in CurrencyPrice.__table__.indexes if index.name == 'ix_currency_prices_currency_date')
+    with engine.begin() as connection:
+        if index.name not in {existing['name'] for existing in inspect(connection).get_indexes('currency_prices')}:
+            connection.execute(text('DELETE FROM currency_prices WHERE id NOT IN '
+                                    '(SELECT MIN(id) FROM currency_prices GROUP BY currency, date)'))
+            index.create(connection)
+
+
+# Data pull form yfinance
+def fetch_currency_data(currency_x, start_date, end_date):
+    data = get_data_source().history(currency_x, start=start_date, end=end_date)
+    return data
+
+
+def to_price_rows(currency: str, data: pd.DataFrame) -> pd.DataFrame:
+    """History frame as currency_prices columns, built column by column without iterating rows."""
+    return pd.DataFrame({'currency': currency,
+                         'date': data.index.date,
+                         'open': data['Open'].to_numpy(),
+                         'high': data['High'].to_numpy(),
+                         'low': data['Low'].to_numpy(),
+                         'close': data['Close'].to_numpy(),
+                         'volume': data['Volume'].to_numpy()})
+
+
+def save_currency_data(session, currency: str, data: pd.DataFrame, batch_size: int = BULK_BATCH_SIZE,
+                       commit: bool = True) -> int:
+    """Upsert a history frame on (currency, date) in executemany batches within one transaction.
+
+    Saving the same range again overwrites the stored prices instead of adding rows. Returns the
+    number of rows written. With commit=False the caller commits, to group several saves.
+    """
+    rows = to_price_rows(currency, data)
+    statement = insert(CurrencyPrice.__table__)
+    statement = statement.on_conflict_do_update(
+        index_elements=['currency', 'date'],
+        set_={name: statement.excluded[name] for name in ('open', 'high', 'low', 'close', 'volume')})
+    for start in range(0, len(rows), batch_size):
+        session.execute(statement, rows.iloc[start:start + batch_size].to_dict('records'))
+    if commit:
+        session.commit()
+    return len(rows)
+
+
+def stored_range(session, currency: str):
+    """First and last stored date of a currency, (None, None) when nothing is stored."""
+    return session.execute(select(func.min(CurrencyPrice.date), func.max(CurrencyPrice.date))
+                           .where(CurrencyPrice.currency == currency)).one()
+
+
+def missing_ranges(session, currency: str, start_date, end_date) -> list[tuple]:
+    """Date ranges to download so that [start_date, end_date) is stored, end exclusive.
+
+    Besides the days before the first and after the last stored day, the stored days within the
+    range are read and every gap of more than HOLIDAY_GAP_DAYS business days between them is
+    downloaded, so ranges synced or backfilled separately get the days in between. Shorter gaps
+    are taken for market holidays.
+    """
+    first, last = stored_range(session, currency)
+    if first is None:
+        return [(start_date, end_date)]
+    ranges = []
+    if start_date < first:
+        ranges.append((start_date, first))
+    # Between these bounds the head and tail downloads do not help, only stored days count
+    lower = max(start_date, first)
+    upper = last + timedelta(days=1) if end_date is None else min(end_date, last + timedelta(days=1))
+    stored = session.scalars(select(CurrencyPrice.date)
+                             .where(CurrencyPrice.currency == currency,
+                                    CurrencyPrice.date >= lower, CurrencyPrice.date < upper)
+                             .order_by(CurrencyPrice.date)).all()
+    gap_start = lower
+    for day in [*stored, upper]:
+        if gap_start < day and np.busday_count(gap_start, day) > HOLIDAY_GAP_DAYS:
+            ranges.append((gap_start, day))
+        gap_start = max(gap_start, day + timedelta(days=1))
+    if end_date is None or end_date > last:
+        # The last stored day may have been saved before the close, download it again
+        ranges.append((max(start_date, last), end_date))
+    return ranges
+
+
+def sync_currency_data(session, currency: str, start_date, end_date) -> int:
+    """Download and upsert only the part of [start_date, end_date) that is not stored yet."""
+    rows = 0
+    for missing_start, missing_end in missing_ranges(session, currency, start_date, end_date):
+        data = fetch_currency_data(currency, missing_start, missing_end)
+        if not data.empty:
+            rows += save_currency_data(session, currency, data)
+    return rows
+
+
+# Price columns of the read API, as labelled in history frames
+PRICE_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+# SQLite expressions giving the bar of a row: the Monday of its week or its month
+RESAMPLE_PERIODS = {
+    'W': lambda column: func.date(column, '-6 days', 'weekday 1'),
+    'M': lambda column: func.strftime('%Y-%m', column),
+}
+
+
+def load_currency_prices(connection, currency: str, start_date=None, end_date=None,
+                         columns=PRICE_COLUMNS, resample: str | None = None) -> pd.DataFrame:
+    """Stored prices of a currency in [start_date, end_date) as a frame indexed by Date.
+
+    Only the requested columns are selected and read straight from the cursor into the frame.
+    With resample 'W' or 'M' the database aggregates daily rows into weekly or monthly OHLC bars,
+    dated by their first trading day, so only the bars leave SQLite.
+    """
+    filters = [CurrencyPrice.currency == currency]
+    if start_date is not None:
+        filters.append(CurrencyPrice.date >= start_date)
+    if end_date is not None:
+        filters.append(CurrencyPrice.date < end_date)
+    if resample is None:
+        statement = (select(CurrencyPrice.date.label('Date'),
+                            *(getattr(CurrencyPrice, column.lower()).label(column) for column in columns))
+                     .where(*filters)
+                     .order_by(CurrencyPrice.date))
+    else:
+        period = RESAMPLE_PERIODS[resample](CurrencyPrice.date)
+        window = {'partition_by': period, 'order_by': CurrencyPrice.date, 'range_': (None, None)}
+        rows = (select(period.label('period'), CurrencyPrice.date, CurrencyPrice.high, CurrencyPrice.low,
+                       CurrencyPrice.volume,
+                       func.first_value(CurrencyPrice.open).over(**window).label('open'),
+                       func.last_value(CurrencyPrice.close).over(**window).label('close'))
+                .where(*filters)
+                .subquery())
+        bars = {'Open': func.max(rows.c.open), 'High': func.max(rows.c.high), 'Low': func.min(rows.c.low),
+                'Close': func.max(rows.c.close), 'Volume': func.sum(rows.c.volume)}
+        statement = (select(func.min(rows.c.date).label('Date'), *(bars[column].label(column) for column in columns))
+                     .group_by(rows.c.period)
+                     .order_by(func.min(rows.c.date)))
+    return pd.read_sql(statement, connection, index_col='Date', parse_dates=['Date'])
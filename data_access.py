@@ -0,0 +1,57 @@
+from sqlalchemy import delete, insert, select, update
+
+from crud_pagination import PAGE_SIZE, keyset_page
+
+
+# Generic Data Access Class
+class DataAccess:
+    @staticmethod
+    def add_item(session, model, **kwargs):
+        new_item = model(**kwargs)
+        session.add(new_item)
+        session.commit()
+
+    @staticmethod
+    def add_items(session, model, rows):
+        # One executemany INSERT for a list of column dicts
+        session.execute(insert(model), rows)
+        session.commit()
+
+    @staticmethod
+    def get_item(session, model, item_id):
+        return session.get(model, item_id)
+
+    @staticmethod
+    def get_all_items(session, model, options=(), columns=None):
+        # Loader options such as joinedload(CatalogItem.category) fetch relationships in the same
+        # query, columns returns plain rows of just those columns instead of model instances
+        if columns is not None:
+            return session.query(*columns).all()
+        return session.query(model).options(*options).all()
+
+    @staticmethod
+    def get_page(session, model, after=None, page_size=PAGE_SIZE, statement=None):
+        # All columns of the model unless a select of its rows is given
+        statement = select(model.__table__) if statement is None else statement
+        return keyset_page(session, statement, model.id, after, page_size)
+
+    @staticmethod
+    def update_item(session, model, item_id, **kwargs):
+        session.execute(update(model).where(model.id == item_id).values(**kwargs))
+        session.commit()
+
+    @staticmethod
+    def update_items(session, model, rows):
+        # Bulk UPDATE by primary key, every dict holds an id and the columns to change
+        session.execute(update(model), rows)
+        session.commit()
+
+    @staticmethod
+    def delete_item(session, model, item_id):
+        session.execute(delete(model).where(model.id == item_id))
+        session.commit()
+
+    @staticmethod
+    def delete_items(session, model, item_ids):
+        session.execute(delete(model).where(model.id.in_(item_ids)))
+        session.commit()
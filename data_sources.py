@@ -0,0 +1,266 @@
+import argparse
+import os
+import pickle
+import random
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+import yfinance as yf
+
+from market_data_cache import MarketDataCache, get_default_cache
+
+# Source picked by get_data_source(): 'yfinance', 'record' or 'replay'
+DEFAULT_SOURCE = os.environ.get('MARKET_DATA_SOURCE', 'yfinance')
+DEFAULT_RECORDINGS_PATH = os.environ.get('MARKET_DATA_RECORDINGS', './recordings')
+DEFAULT_LATENCY = float(os.environ.get('MARKET_DATA_LATENCY', '0'))
+DEFAULT_JITTER = float(os.environ.get('MARKET_DATA_JITTER', '0'))
+
+
+def _slice(frame: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    # Rows in [start, end), with naive bounds read in the time zone of the index
+    def timestamp(value):
+        value = pd.Timestamp(value)
+        tz = getattr(frame.index, 'tz', None)
+        return value.tz_localize(tz) if tz is not None and value.tzinfo is None else value
+
+    first = 0 if start is None else frame.index.searchsorted(timestamp(start))
+    last = len(frame) if end is None else frame.index.searchsorted(timestamp(end))
+    return frame.iloc[first:last]
+
+
+def _last_period(frame: pd.DataFrame, period: str) -> pd.DataFrame:
+    # yfinance periods such as 5d, 3mo, 1y, ytd and max
+    if frame.empty or period == 'max':
+        return frame
+    last = frame.index[-1]
+    if period == 'ytd':
+        return frame[frame.index.year == last.year]
+    units = {'d': 'days', 'wk': 'weeks', 'mo': 'months', 'y': 'years'}
+    for suffix, unit in units.items():
+        if period.endswith(suffix) and period[:-len(suffix)].isdigit():
+            return _slice(frame, last - pd.DateOffset(**{unit: int(period[:-len(suffix)])}))
+    raise ValueError(f"Unsupported period {period!r}")
+
+
+class DataSource:
+    """Where Stock, StockUniverse and the currency analyzer get their market data from.
+
+    dataset() returns a yfinance Ticker attribute by name (info, news, balance_sheet, ...),
+    history() the same frame as Ticker.history() and download() the same as yf.download().
+    """
+
+    def get_cache(self) -> MarketDataCache:
+        """Cache Stock and StockUniverse keep this source's responses in, unless given another."""
+        return get_default_cache()
+
+    def history(self, ticker: str, **kwargs) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def dataset(self, ticker: str, name: str):
+        raise NotImplementedError
+
+    def download(self, tickers: list[str], interval: str = '1d', **kwargs) -> pd.DataFrame:
+        # Default for sources that only know single tickers, columns are (field, ticker)
+        frames = {}
+        for ticker in tickers:
+            frame = self.history(ticker, interval=interval, **kwargs)
+            if interval.endswith('d') and getattr(frame.index, 'tz', None) is not None:
+                frame = frame.tz_localize(None)
+            frames[ticker] = frame
+        return pd.concat(frames, axis=1).swaplevel(axis=1).sort_index(axis=1)
+
+
+class YFinanceSource(DataSource):
+    """Live data from Yahoo Finance."""
+
+    def __init__(self) -> None:
+        self._tickers: dict[str, yf.Ticker] = {}
+
+    def __repr__(self):
+        return "YFinanceSource()"
+
+    def _ticker(self, ticker: str) -> yf.Ticker:
+        if ticker not in self._tickers:
+            self._tickers[ticker] = yf.Ticker(ticker)
+        return self._tickers[ticker]
+
+    def history(self, ticker: str, **kwargs) -> pd.DataFrame:
+        return self._ticker(ticker).history(**kwargs)
+
+    def dataset(self, ticker: str, name: str):
+        return getattr(self._ticker(ticker), name)
+
+    def download(self, tickers: list[str], interval: str = '1d', **kwargs) -> pd.DataFrame:
+        return yf.download(tickers, interval=interval, group_by='column', auto_adjust=True,
+                           multi_level_index=True, progress=False, threads=True, **kwargs)
+
+
+class RecordingSource(DataSource):
+    """Passes requests to another source and records every response under a directory.
+
+    Histories are merged into one file per ticker and interval so that a replay can serve any
+    date range that was recorded, other datasets are stored one file per ticker and name. Its
+    responses are cached in memory only, a hit in the shared cache would go unrecorded.
+    """
+
+    def __init__(self, source: DataSource, path: str = DEFAULT_RECORDINGS_PATH) -> None:
+        self.source = source
+        self.path = Path(path)
+        self.cache = MarketDataCache(':memory:')
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"RecordingSource({self.source!r}, {str(self.path)!r})"
+
+    def get_cache(self) -> MarketDataCache:
+        return self.cache
+
+    def _write(self, ticker: str, name: str, value) -> None:
+        file = self.path / ticker / f'{name}.pkl'
+        file.parent.mkdir(parents=True, exist_ok=True)
+        with open(file, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _record_history(self, ticker: str, interval: str, frame: pd.DataFrame) -> None:
+        file = self.path / ticker / f'history-{interval}.pkl'
+        with self._lock:
+            if file.exists():
+                with open(file, 'rb') as f:
+                    recorded = pickle.load(f)
+                tz, frame_tz = getattr(recorded.index, 'tz', None), getattr(frame.index, 'tz', None)
+                # Daily downloads come without a time zone, Ticker.history with the exchange's
+                if tz is None and frame_tz is not None:
+                    frame = frame.tz_localize(None)
+                elif tz is not None and frame_tz is None:
+                    frame = frame.tz_localize(tz)
+                elif tz != frame_tz:
+                    frame = frame.tz_convert(tz)
+                frame = pd.concat([recorded, frame])
+                frame = frame[~frame.index.duplicated(keep='last')].sort_index()
+            self._write(ticker, f'history-{interval}', frame)
+
+    def history(self, ticker: str, **kwargs) -> pd.DataFrame:
+        frame = self.source.history(ticker, **kwargs)
+        self._record_history(ticker, kwargs.get('interval', '1d'), frame)
+        return frame
+
+    def dataset(self, ticker: str, name: str):
+        value = self.source.dataset(ticker, name)
+        with self._lock:
+            self._write(ticker, name, value)
+        return value
+
+    def download(self, tickers: list[str], interval: str = '1d', **kwargs) -> pd.DataFrame:
+        frame = self.source.download(tickers, interval=interval, **kwargs)
+        for ticker in frame.columns.get_level_values(1).unique():
+            self._record_history(ticker, interval, frame.xs(ticker, axis=1, level=1).dropna(how='all'))
+        return frame
+
+
+class ReplaySource(DataSource):
+    """Serves recorded responses without network access, after an injected latency.
+
+    Every request sleeps latency plus a uniform random jitter in seconds, which stands in for
+    the Yahoo round-trip when benchmarking. Its responses are cached in memory only, so a replay
+    never serves live data from the shared cache.
+    """
+
+    def __init__(self, path: str = DEFAULT_RECORDINGS_PATH, latency: float = DEFAULT_LATENCY,
+                 jitter: float = DEFAULT_JITTER, seed: int | None = 0) -> None:
+        self.path = Path(path)
+        self.latency = latency
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self.cache = MarketDataCache(':memory:')
+        self._loaded: dict[tuple[str, str], object] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"ReplaySource({str(self.path)!r}, latency={self.latency}, jitter={self.jitter})"
+
+    def get_cache(self) -> MarketDataCache:
+        return self.cache
+
+    def _read(self, ticker: str, name: str):
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            if (ticker, name) not in self._loaded:
+                file = self.path / ticker / f'{name}.pkl'
+                if not file.exists():
+                    raise LookupError(f"No recording of {name} for {ticker} in {self.path}")
+                with open(file, 'rb') as f:
+                    self._loaded[ticker, name] = pickle.load(f)
+        time.sleep(delay)
+        return self._loaded[ticker, name]
+
+    def history(self, ticker: str, start=None, end=None, period: str | None = None,
+                interval: str = '1d', **kwargs) -> pd.DataFrame:
+        frame = self._read(ticker, f'history-{interval}')
+        if start is None and end is None:
+            return _last_period(frame, period or '1mo').copy()
+        return _slice(frame, start, end).copy()
+
+    def dataset(self, ticker: str, name: str):
+        return self._read(ticker, name)
+
+
+_source: DataSource | None = None
+_source_lock = threading.Lock()
+
+
+def get_data_source() -> DataSource:
+    """Process-wide data source, picked by the MARKET_DATA_SOURCE environment variable."""
+    global _source
+    with _source_lock:
+        if _source is None:
+            if DEFAULT_SOURCE == 'replay':
+                _source = ReplaySource()
+            elif DEFAULT_SOURCE == 'record':
+                _source = RecordingSource(YFinanceSource())
+            elif DEFAULT_SOURCE == 'yfinance':
+                _source = YFinanceSource()
+            else:
+                raise ValueError(f"Unknown MARKET_DATA_SOURCE {DEFAULT_SOURCE!r}")
+        return _source
+
+
+def set_data_source(source: DataSource) -> None:
+    global _source
+    with _source_lock:
+        _source = source
+
+
+# Datasets read by Stock besides price history
+RECORDED_DATASETS = ('info', 'news', 'balance_sheet', 'cash_flow', 'income_stmt', 'calendar',
+                     'earnings_estimate', 'revenue_estimate', 'eps_trend', 'recommendations_summary',
+                     'analyst_price_targets')
+
+
+def record(tickers: list[str], start_date: str, intervals: list[str], path: str = DEFAULT_RECORDINGS_PATH) -> None:
+    """Record price histories and every Stock dataset of the tickers from Yahoo Finance."""
+    recorder = RecordingSource(YFinanceSource(), path)
+    for ticker in tickers:
+        for interval in intervals:
+            recorder.history(ticker, start=start_date, interval=interval)
+        for name in RECORDED_DATASETS:
+            try:
+                recorder.dataset(ticker, name)
+            except Exception as e:
+                print(f"Skipped {name} for {ticker}: {e!r}")
+        print(f"Recorded {ticker}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Record Yahoo Finance responses for offline replay.')
+    parser.add_argument('tickers', nargs='+')
+    parser.add_argument('--start', default='2015-01-01')
+    parser.add_argument('--interval', action='append', dest='intervals')
+    parser.add_argument('--path', default=DEFAULT_RECORDINGS_PATH)
+    args = parser.parse_args()
+    record(args.tickers, args.start, args.intervals or ['1d'], args.path)
+
+
+if __name__ == "__main__":
+    main()
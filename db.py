@@ -0,0 +1,164 @@
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy.orm import sessionmaker
+
+from sql_profiler import record_statement
+
+# Applied to every new SQLite connection: WAL lets readers run while a writer commits
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -64_000,
+    'temp_store': 'MEMORY',
+    'mmap_size': 256 * 1024 * 1024,
+}
+# Those of them that are set per database, for attached databases as well
+SCHEMA_PRAGMAS = ('journal_mode', 'synchronous', 'cache_size', 'mmap_size')
+
+# Engines, session factories and created schemas of this process, per database url
+_engines = {}
+_sessionmakers = {}
+_schemas = set()
+# Statements, seconds and slowest statement per database url
+_timings = {}
+_lock = threading.Lock()
+# Held while DDL runs, which reports its statements through the timing hooks under _lock
+_schema_lock = threading.Lock()
+
+
+def _set_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f'PRAGMA {name}={value}')
+    cursor.close()
+
+
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_started'].pop()
+    with _lock:
+        timings = _timings.setdefault(str(conn.engine.url), {'statements': 0, 'seconds': 0.0, 'slowest': 0.0})
+        timings['statements'] += 1
+        timings['seconds'] += elapsed
+        timings['slowest'] = max(timings['slowest'], elapsed)
+    record_statement(conn, cursor, statement, parameters, executemany, elapsed)
+
+
+def _discard_timer(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    if exception_context.connection is not None and exception_context.connection.info.get('query_started'):
+        exception_context.connection.info['query_started'].pop()
+
+
+def _attach(attached: dict):
+    """Connect listener attaching {schema: path} SQLite databases to every new connection."""
+    def attach(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for schema, path in attached.items():
+            cursor.execute(f'ATTACH DATABASE ? AS "{schema}"', (path,))
+            for name in SCHEMA_PRAGMAS:
+                cursor.execute(f'PRAGMA "{schema}".{name}={SQLITE_PRAGMAS[name]}')
+        cursor.close()
+
+    return attach
+
+
+def configure_sqlite(engine, attached: dict | None = None) -> None:
+    """Apply SQLITE_PRAGMAS and attach databases on every new connection of a (sync) engine."""
+    event.listen(engine, 'connect', _set_pragmas)
+    if attached:
+        event.listen(engine, 'connect', _attach(attached))
+
+
+def _create_engine(url: str, attached: dict):
+    database = make_url(url).database
+    if url.startswith('sqlite') and database and database != ':memory:':
+        for path in (database, *attached.values()):
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+    engine = create_engine(url)
+    if engine.dialect.name == 'sqlite':
+        configure_sqlite(engine, attached)
+    event.listen(engine, 'before_cursor_execute', _start_timer)
+    event.listen(engine, 'after_cursor_execute', _stop_timer)
+    event.listen(engine, 'handle_error', _discard_timer)
+    return engine
+
+
+def get_engine(url: str, attached: dict | None = None):
+    """Engine and connection pool of a database, created once per process.
+
+    Streamlit executes a script again on every rerun, so scripts get their engine here instead of
+    calling create_engine at import. SQLite databases get their directory created and
+    SQLITE_PRAGMAS applied on every connection. attached maps schema names to further SQLite
+    files that every connection attaches, so several databases share one pool; it only takes
+    effect on the call that creates the engine.
+    """
+    with _lock:
+        engine = _engines.get(url)
+        if engine is None:
+            engine = _engines[url] = _create_engine(url, attached or {})
+        return engine
+
+
+def schema_bind(engine, schema: str | None):
+    """The engine, or a view of it whose schema-less tables live in an attached database."""
+    return engine if schema is None else engine.execution_options(schema_translate_map={None: schema})
+
+
+def database_key(bind) -> str:
+    """Name of the database a bind writes to, its url plus the attached schema if any."""
+    schema = (bind.get_execution_options().get('schema_translate_map') or {}).get(None)
+    return str(bind.url) if schema is None else f'{bind.url}#{schema}'
+
+
+def init_schema(engine, metadata, migrations=(), schema: str | None = None) -> None:
+    """Create the tables of metadata and run migrations(bind), once per database and set of tables.
+
+    Tables are identified by name, so the fresh metadata of a rerun script does not repeat the
+    DDL checks. With a schema the tables are created in that attached database.
+    """
+    bind = schema_bind(engine, schema)
+    key = (database_key(bind), tuple(sorted(metadata.tables)))
+    with _schema_lock:
+        if key in _schemas:
+            return
+        metadata.create_all(bind=bind)
+        for migrate in migrations:
+            migrate(bind)
+        _schemas.add(key)
+
+
+def get_sessionmaker(url: str, metadata=None, migrations=(), schema: str | None = None):
+    """Session factory of a database, with its schema created first when metadata is given."""
+    engine = get_engine(url)
+    if metadata is not None:
+        init_schema(engine, metadata, migrations, schema)
+    with _lock:
+        if (url, schema) not in _sessionmakers:
+            _sessionmakers[url, schema] = sessionmaker(autocommit=False, autoflush=False,
+                                                       bind=schema_bind(engine, schema))
+        return _sessionmakers[url, schema]
+
+
+def stats() -> dict:
+    """Pool status and statement timings of every engine of this process."""
+    with _lock:
+        return {url: {'pool': engine.pool.status(),
+                      **_timings.get(str(engine.url), {'statements': 0, 'seconds': 0.0, 'slowest': 0.0})}
+                for url, engine in _engines.items()}
+
+
+def dispose_engines() -> None:
+    with _schema_lock, _lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+        _sessionmakers.clear()
+        _schemas.clear()
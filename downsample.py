@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+# About one point per horizontal pixel of a wide layout chart
+DEFAULT_MAX_POINTS = 1000
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """Positions kept by Largest-Triangle-Three-Buckets, always including the first and last point."""
+    n = len(x)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+    every = (n - 2) / (max_points - 2)
+    indices = np.empty(max_points, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(max_points - 2):
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
+
+def minmax_indices(y: np.ndarray, max_points: int) -> np.ndarray:
+    """Positions of the minimum and maximum of each bucket, two points per bucket."""
+    n = len(y)
+    if max_points >= n or max_points < 4:
+        return np.arange(n)
+    edges = np.linspace(0, n, max_points // 2 + 1).astype(np.int64)
+    kept = [0, n - 1]
+    for start, end in zip(edges[:-1], edges[1:]):
+        bucket = y[start:end]
+        if len(bucket) and not np.isnan(bucket).all():
+            kept += [start + int(np.nanargmin(bucket)), start + int(np.nanargmax(bucket))]
+    return np.unique(kept)
+
+
+def downsample(frame: pd.DataFrame, column: str, max_points: int = DEFAULT_MAX_POINTS,
+               method: str = 'lttb') -> pd.DataFrame:
+    """Rows of frame picked on one column, at most max_points of them, with every column kept."""
+    if len(frame) <= max_points:
+        return frame
+    y = frame[column].ffill().bfill().to_numpy(dtype=np.float64)
+    if method == 'lttb':
+        x = frame.index.asi8.astype(np.float64)
+        indices = lttb_indices(x, y, max_points)
+    elif method == 'minmax':
+        indices = minmax_indices(y, max_points)
+    else:
+        raise ValueError(f"Unknown downsampling method {method!r}")
+    return frame.iloc[indices]
+
+
+def fold(frame: pd.DataFrame, columns: list[str], date_column: str = 'Date') -> pd.DataFrame:
+    """Long key/value frame for Altair, the server-side equivalent of transform_fold(columns)."""
+    long = frame[columns].rename_axis(date_column).reset_index()
+    return long.melt(id_vars=date_column, value_vars=columns, var_name='key', value_name='value')
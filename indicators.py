@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+
+# Indicators memoized per engine, the least recently read ones are dropped beyond this
+MAX_INDICATORS = 16
+
+
+class _Buffer:
+    """Growable float64 array with amortized O(1) appends and cheap truncation."""
+
+    def __init__(self) -> None:
+        self._data = np.empty(0)
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def view(self) -> np.ndarray:
+        return self._data[:self._length]
+
+    def truncate(self, length: int) -> None:
+        self._length = min(self._length, length)
+
+    def extend(self, values: np.ndarray) -> None:
+        needed = self._length + len(values)
+        if needed > len(self._data):
+            data = np.empty(max(needed, 2 * len(self._data), 1024))
+            data[:self._length] = self._data[:self._length]
+            self._data = data
+        self._data[self._length:needed] = values
+        self._length = needed
+
+
+class IndicatorEngine:
+    """Indicators of one close price series, memoized per kind and window and updated incrementally.
+
+    When bars are appended, or the last bars are replaced, each memoized indicator is computed
+    only for the changed bars. Rolling mean and standard deviation read back window - 1 stored
+    closes; EMA, returns and drawdown carry their state in the previous value. Only the
+    MAX_INDICATORS most recently read indicators are kept and updated.
+    """
+
+    def __init__(self, close=()) -> None:
+        self._close = _Buffer()
+        self._indicators: dict[tuple[str, int], _Buffer] = {}
+        self.update(0, np.asarray(close, dtype=np.float64))
+
+    def __repr__(self):
+        return f"IndicatorEngine({len(self)} bars, {len(self._indicators)} indicators)"
+
+    def __len__(self):
+        return len(self._close)
+
+    @property
+    def close(self) -> np.ndarray:
+        return self._close.view()
+
+    def update(self, position: int, close: np.ndarray) -> None:
+        """Replace the bars from position on with close; pass position 0 to start over."""
+        self._close.truncate(position)
+        self._close.extend(np.asarray(close, dtype=np.float64))
+        for key, buffer in self._indicators.items():
+            buffer.truncate(position)
+            buffer.extend(self._compute(key, position))
+
+    def append(self, close: np.ndarray) -> None:
+        self.update(len(self), close)
+
+    def _compute(self, key: tuple[str, int], position: int) -> np.ndarray:
+        kind, window = key
+        close = self.close
+        if position >= len(close):
+            return np.empty(0)
+        if kind in ('sma', 'std'):
+            first = max(0, position - window + 1)
+            rolling = pd.Series(close[first:]).rolling(window)
+            values = rolling.mean() if kind == 'sma' else rolling.std()
+            return values.to_numpy()[position - first:]
+        if kind == 'ema':
+            previous = self._indicators[key].view()[position - 1:position]
+            values = pd.Series(np.concatenate([previous, close[position:]])).ewm(span=window, adjust=False).mean()
+            return values.to_numpy()[len(previous):]
+        if kind == 'returns':
+            first = max(0, position - 1)
+            values = close[first + 1:] / close[first:-1] - 1
+            return np.concatenate([[np.nan], values]) if position == 0 else values
+        if kind == 'peak':
+            previous = self._indicators[key].view()[position - 1:position]
+            return np.fmax.accumulate(np.concatenate([previous, close[position:]]))[len(previous):]
+        if kind == 'drawdown':
+            return close[position:] / self._indicators['peak', 0].view()[position:] - 1
+        raise ValueError(f"Unknown indicator {kind!r}")
+
+    def _get(self, kind: str, window: int = 0) -> np.ndarray:
+        key = (kind, window)
+        buffer = self._indicators.pop(key, None)
+        if buffer is None:
+            while len(self._indicators) >= MAX_INDICATORS:
+                self._forget(next(iter(self._indicators)))
+            buffer = _Buffer()
+            self._indicators[key] = buffer
+            buffer.extend(self._compute(key, 0))
+        else:
+            # Reinserted as the most recently read
+            self._indicators[key] = buffer
+        return buffer.view()
+
+    def _forget(self, key: tuple[str, int]) -> None:
+        self._indicators.pop(key, None)
+        if key == ('peak', 0):
+            # Drawdown is updated from the peak
+            self._indicators.pop(('drawdown', 0), None)
+
+    def sma(self, window: int) -> np.ndarray:
+        return self._get('sma', window)
+
+    def ema(self, span: int) -> np.ndarray:
+        return self._get('ema', span)
+
+    def rolling_std(self, window: int) -> np.ndarray:
+        return self._get('std', window)
+
+    def returns(self) -> np.ndarray:
+        return self._get('returns')
+
+    def drawdown(self) -> np.ndarray:
+        self._get('peak')
+        return self._get('drawdown')
@@ -0,0 +1,70 @@
+import pandas as pd
+import streamlit as st
+from sqlalchemy import func, select
+
+from crud_models import Country, LongTermInterestRate
+
+# Years shown by default in the time series screen
+DEFAULT_YEARS = 30
+# Countries drawn in the chart by default
+DEFAULT_CHART_COUNTRIES = 10
+
+
+def year_range(session):
+    """First and last stored year, (None, None) when no rates are stored."""
+    return session.execute(select(func.min(LongTermInterestRate.year), func.max(LongTermInterestRate.year))).one()
+
+
+def rate_matrix(session, start_year=None, end_year=None) -> pd.DataFrame:
+    """Rates as a country x year frame, read with one aggregate query and pivoted by pandas."""
+    filters = []
+    if start_year is not None:
+        filters.append(LongTermInterestRate.year >= start_year)
+    if end_year is not None:
+        filters.append(LongTermInterestRate.year <= end_year)
+    rows = session.execute(select(Country.name.label("country"), LongTermInterestRate.year,
+                                  func.avg(LongTermInterestRate.rate).label("rate"))
+                           .join(Country, LongTermInterestRate.country_id == Country.id)
+                           .where(*filters)
+                           .group_by(LongTermInterestRate.country_id, LongTermInterestRate.year)).all()
+    frame = pd.DataFrame(rows, columns=["country", "year", "rate"])
+    return frame.pivot(index="country", columns="year", values="rate").sort_index()
+
+
+def spreads(matrix: pd.DataFrame, benchmark: str) -> pd.DataFrame:
+    """Rate of every country minus the benchmark country's rate of the same year."""
+    if benchmark not in matrix.index:
+        return matrix.iloc[0:0]
+    return matrix - matrix.loc[benchmark]
+
+
+def year_over_year(matrix: pd.DataFrame) -> pd.DataFrame:
+    """Change of every country's rate from the previous year."""
+    return matrix.diff(axis=1)
+
+
+def show_time_series(session, model, key: str) -> None:
+    first, last = year_range(session)
+    if first is None:
+        st.info("No interest rates stored yet")
+        return
+    start, end = first, last
+    if first < last:
+        start, end = st.slider("Years", first, last, (max(first, last - DEFAULT_YEARS), last), key=f"{key}_years")
+    matrix = rate_matrix(session, start, end)
+    if matrix.empty:
+        st.info("No interest rates of known countries in these years")
+        return
+
+    view = st.radio("Show", ["Rates", "Spread to benchmark", "Year-over-year change"], horizontal=True,
+                    key=f"{key}_view")
+    if view == "Spread to benchmark":
+        benchmark = st.selectbox("Benchmark country", list(matrix.index), key=f"{key}_benchmark")
+        matrix = spreads(matrix, benchmark)
+    elif view == "Year-over-year change":
+        matrix = year_over_year(matrix)
+
+    countries = st.multiselect("Countries in the chart", list(matrix.index),
+                               default=list(matrix.index[:DEFAULT_CHART_COUNTRIES]), key=f"{key}_countries")
+    st.line_chart(matrix.loc[countries].T)
+    st.dataframe(matrix, use_container_width=True)
@@ -1,145 +1,204 @@
 import streamlit as st
-import yfinance as yf
 import altair as alt
 import pandas as pd
+import time
 
 from datetime import date
 
-# from pandas.core.interchange.dataframe_protocol import DataFrame
-
-
-class Stock:
-    def __init__(self, ticker: str = 'CAT') -> None:
-        self.ticker = yf.Ticker(ticker)
-        self.industry = self.ticker.info.get('sectorKey')
-
-    def __repr__(self):
-        return f"{self.ticker.ticker}"
-
-    def get_info(self):
-        stock_info = self.ticker.info["longBusinessSummary"]
-        return stock_info
-
-    def get_news(self):
-        stock_news_list = list()
-        stock_news = self.ticker.news
-        for i, value in enumerate(stock_news):
-            stock_news_list.append({'title': value['title'], 'link': value['link']})
-        stock_news = pd.DataFrame(stock_news_list)
-        return stock_news
-
-    def get_quotes(self, start_date: str = '2022-01-01', end_date=None):
-        stock_history = self.ticker.history(start=start_date, end=end_date)
-        return stock_history
-
-    def get_volatility(self, start_date: str = '2022-01-01', end_date=None):
-        stock_history = self.ticker.history(start=start_date, end=end_date)
-        stock_volatility = stock_history.copy()
-        stock_volatility['Volatility'] = stock_volatility['Close'] / stock_volatility['Close'].shift() - 1
-        return stock_volatility
-
-    def get_balance(self):
-        stock_balance = self.ticker.balance_sheet
-        return stock_balance
-
-    def get_cashflow(self):
-        stock_cashflow = self.ticker.cash_flow
-        return stock_cashflow
-
-    def get_income_statement(self):
-        stock_income_statement = self.ticker.income_stmt
-        return stock_income_statement
-
-    def get_calendar(self):
-        stock_calendar = self.ticker.calendar
-        return stock_calendar
-
-    def get_earning_estimates(self):
-        stock_earning_estimates = self.ticker.earnings_estimate
-        return stock_earning_estimates
-
-    def get_revenue_estimates(self):
-        stock_revenue_estimates = self.ticker.revenue_estimate
-        return stock_revenue_estimates
+from downsample import DEFAULT_MAX_POINTS, downsample, fold
+from perf import phase
+from stock import Stock
+from stock_universe import StockUniverse
 
-    def get_eps_trends(self):
-        stock_eps_estimates_trends = self.ticker.eps_trend
-        return stock_eps_estimates_trends
-
-    def get_recommendations(self) -> dict:
-        stock_recommendations = self.ticker.recommendations_summary
-        stock_price_targets = self.ticker.analyst_price_targets
-        recommendations = {'stock_recommendations': stock_recommendations,
-                           'stock_price_targets': stock_price_targets}
-        return recommendations
+# from pandas.core.interchange.dataframe_protocol import DataFrame
 
 
 st.title('Analytic world!')
 st.subheader(f'This is sub-header for stock analysis')
 
-tickers = st.selectbox('Stock name:', ['AAPL', 'CAT', 'PLTR',
-                                       'BA', 'MSFT',
-                                       'C', 'GE', 'FDX', 'DIS',
-                                       'PZU.WA', 'OPL.WA',
-                                       'ETFBTBSP.WA', 'ETFBM40TR.WA',
-                                       'IHYA.L'], key='ticker')
-stock = Stock(st.session_state['ticker'])
-
-tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(['General information',
-                                              'Price history',
-                                              'Balance Sheet',
-                                              'Cash Flow',
-                                              'Income Statement',
-                                              'Estimates'])
-
-with tab1:
+TICKERS = ['AAPL', 'CAT', 'PLTR',
+           'BA', 'MSFT',
+           'C', 'GE', 'FDX', 'DIS',
+           'PZU.WA', 'OPL.WA',
+           'ETFBTBSP.WA', 'ETFBM40TR.WA',
+           'IHYA.L']
+
+# Section widgets and their defaults. Streamlit drops the state of widgets that are not rendered,
+# i.e. those of the hidden sections, so their values are copied to '_kept_<key>' after every run
+# and handed back when the section is shown again.
+KEPT_WIDGETS = {'start_date': date(2024, 1, 2), 'moving_average': 1, 'chart_points': DEFAULT_MAX_POINTS,
+                'log_axis': False, 'income_statement_item': None, 'radio_choice': 'stock_recommendations',
+                'watchlist': TICKERS, 'watchlist_start_date': date(2024, 1, 2), 'volatility_window': 21}
+# Opened sections kept per session, each for at most SECTION_TTL seconds
+SECTION_CACHE_SIZE = 32
+SECTION_TTL = 15 * 60
+# Tickers whose prefetched fundamentals are kept per session
+PREFETCH_CACHE_SIZE = 8
+
+# Zoomed ranges up to this many days use hourly bars, which Yahoo keeps for about two years
+ZOOM_INTRADAY_DAYS = 30
+INTRADAY_HISTORY_DAYS = 720
+
+tickers = st.selectbox('Stock name:', TICKERS, key='ticker')
+st.sidebar.checkbox('Load company metadata', value=True, key='metadata',
+                    help='Turn off to skip the slow info request entirely.')
+with phase('stock'):
+    stock = Stock(st.session_state['ticker'], metadata=st.session_state['metadata'])
+
+    # Fundamentals of all sections are requested together in the background when a ticker is first shown,
+    # and again once they are older than the cache keeps fundamentals
+    prefetched = st.session_state.setdefault('prefetched', {})
+    prefetched_at, fundamentals = prefetched.get(stock.symbol, (0.0, None))
+    if time.time() - prefetched_at > stock.cache.ttl('balance_sheet'):
+        fundamentals = stock.prefetch()
+        prefetched.pop(stock.symbol, None)
+        while len(prefetched) >= PREFETCH_CACHE_SIZE:
+            prefetched.pop(next(iter(prefetched)))
+        prefetched[stock.symbol] = (time.time(), fundamentals)
+
+
+def kept(key: str, options=None) -> str:
+    """Key of a section widget, seeded with its kept value, or its default, when it has no state."""
+    if key not in st.session_state:
+        value = st.session_state.get(f'_kept_{key}', KEPT_WIDGETS[key])
+        if value is not None and (options is None or value in options):
+            st.session_state[key] = list(value) if isinstance(value, list) else value
+    return key
+
+
+def save_kept_widgets():
+    # Still holds the widgets of this run, they are only removed after it
+    for key in KEPT_WIDGETS:
+        if key in st.session_state:
+            st.session_state[f'_kept_{key}'] = st.session_state[key]
+
+
+def load_section(name: str, loader):
+    """Fetch the data of a section the first time it is opened and keep it for later reruns.
+
+    Only the SECTION_CACHE_SIZE most recently loaded sections are kept, for SECTION_TTL seconds.
+    """
+    loaded = st.session_state.setdefault('loaded_sections', {})
+    # Sections read metadata only when it is turned on, so data loaded without it is kept apart
+    key = (st.session_state['ticker'], st.session_state['metadata'], name)
+    loaded_at, data = loaded.get(key, (0.0, None))
+    if time.time() - loaded_at > SECTION_TTL:
+        with phase('sections'):
+            data = loader()
+        loaded.pop(key, None)
+        while len(loaded) >= SECTION_CACHE_SIZE:
+            loaded.pop(next(iter(loaded)))
+        loaded[key] = (time.time(), data)
+    return data
+
+
+def fundamental(getter: str):
+    """Prefetched result of a Stock getter, waiting for it only when it is still running."""
+    with phase('fundamentals'):
+        value = fundamentals.get(getter)
+    if getter in fundamentals.errors:
+        st.warning(f'Could not load {getter.removeprefix("get_")} for {stock}: {fundamentals.errors[getter]!r}')
+        # Request only this getter again on the next rerun
+        fundamentals.retry(getter)
+    return value
+
+
+def load_general_information():
+    try:
+        info = stock.get_info()
+    except KeyError:
+        info = None
+    return {'info': info, 'news': stock.get_news()}
+
+
+def show_general_information():
+    data = load_section('General information', load_general_information)
     col1, col2 = st.columns(2)
     with col1:
-        st.subheader(f'Data for the {stock.ticker.ticker}')
+        st.subheader(f'Data for the {stock.symbol}')
     with col2:
         st.slider('Slider:', 0, 10, 0)
-    try:
-        st.markdown(stock.get_info())
-    except KeyError as e:
-        pass
+    if data['info'] is not None:
+        st.markdown(data['info'])
     st.divider()
     st.subheader('News roll:')
-    st.dataframe(stock.get_news())
-
-with tab2:
-    st.date_input('Pick start date:', value=date(2024, 1, 2), key='start_date')
-    st.number_input('Insert moving average length:', min_value=1, max_value=250, step=1, value=1, key='moving_average')
-    df = stock.get_quotes(start_date=st.session_state["start_date"])
-    df['Ma'] = df['Close'].rolling(st.session_state['moving_average']).mean()
+    st.dataframe(data['news'])
+
+
+def zoom_range(chart_key: str):
+    """Date range brushed on the price chart in the previous run, None when not zoomed."""
+    selection = (st.session_state.get(chart_key) or {}).get('selection', {}).get('zoom', {})
+    values = selection.get('Date')
+    if not values:
+        return None
+    return tuple(pd.to_datetime(value, unit='ms') if isinstance(value, (int, float)) else pd.to_datetime(value)
+                 for value in values)
+
+
+def show_price_history():
+    # Price history depends on the widgets below and is kept by Stock's price history store
+    st.date_input('Pick start date:', key=kept('start_date'))
+    st.number_input('Insert moving average length:', min_value=1, max_value=250, step=1, key=kept('moving_average'))
+    st.select_slider('Chart points:', options=[250, 500, 1000, 2000, 4000], key=kept('chart_points'))
+
+    # Brushing the chart zooms in; short zoomed ranges switch to hourly bars for more detail
+    resets = st.session_state.setdefault('price_chart_resets', 0)
+    chart_key = f'price_chart_{stock}_{resets}'
+    zoom = zoom_range(chart_key)
+    start_date, end_date, interval = st.session_state["start_date"], None, '1d'
+    if zoom is not None:
+        start_date, end_date = zoom
+        if end_date - start_date <= pd.Timedelta(days=ZOOM_INTRADAY_DAYS) \
+                and pd.Timestamp.now() - start_date < pd.Timedelta(days=INTRADAY_HISTORY_DAYS):
+            interval = '1h'
+        st.caption(f'Zoomed to {start_date:%Y-%m-%d} - {end_date:%Y-%m-%d} ({interval} bars)')
+        if st.button('Reset zoom'):
+            st.session_state['price_chart_resets'] += 1
+            st.rerun()
+
+    with phase('quotes'):
+        ma_column = stock.get_moving_average(st.session_state['moving_average'])
+        df = stock.get_quotes(start_date=start_date, end_date=end_date, interval=interval,
+                              moving_average=st.session_state['moving_average'])
+        df_vol = stock.get_volatility(start_date=start_date, end_date=end_date, interval=interval)
     st.write(f'Stock price of {stock}')
 
-    ax_type = st.checkbox('Y axis log type:', value=False)
+    ax_type = st.checkbox('Y axis log type:', key=kept('log_axis'))
     if ax_type:
         type_of_axis = "symlog"
     else:
         type_of_axis = "linear"
 
-    st.altair_chart(alt.Chart(df.reset_index()).transform_fold(['Close', 'Ma'])
-                    .mark_line()
-                    .encode(x=alt.X('Date:T', axis=alt.Axis(format='%B %Y')),
-                            y=alt.Y('value:Q').scale(domainMin=df['Close'].min() * 0.98, type = type_of_axis),
-                            color='key:O'), use_container_width=True)
-    df_vol = stock.get_volatility(start_date=st.session_state['start_date'])
-    st.line_chart(df_vol['Volatility'])
+    # Downsample and fold before the data is serialized, the browser only gets the point budget
+    with phase('transform'):
+        chart_data = fold(downsample(df, 'Close', st.session_state['chart_points']), ['Close', ma_column])
+        volatility = downsample(df_vol, 'Volatility', st.session_state['chart_points'], method='minmax')['Volatility']
+    with phase('chart_spec'):
+        st.altair_chart(alt.Chart(chart_data)
+                        .mark_line()
+                        .encode(x=alt.X('Date:T', axis=alt.Axis(format='%B %Y')),
+                                y=alt.Y('value:Q').scale(domainMin=df['Close'].min() * 0.98, type = type_of_axis),
+                                color='key:O')
+                        .add_params(alt.selection_interval(name='zoom', encodings=['x'])),
+                        use_container_width=True, on_select='rerun', selection_mode='zoom', key=chart_key)
+        st.line_chart(volatility)
     st.expander('Price history').dataframe(df)
 
-with tab3:
-    st.dataframe(stock.get_balance())
 
-with tab4:
-    st.expander('Expand frame to see data: ').dataframe(stock.get_calendar())
-    st.dataframe(stock.get_cashflow())
+def show_balance_sheet():
+    st.dataframe(fundamental('get_balance'))
+
+
+def show_cash_flow():
+    st.expander('Expand frame to see data: ').dataframe(fundamental('get_calendar'))
+    st.dataframe(fundamental('get_cashflow'))
 
-with tab5:
+
+def show_income_statement():
     try:
-        df_inc_stat = pd.DataFrame(stock.get_income_statement())
+        df_inc_stat = pd.DataFrame(fundamental('get_income_statement'))
         inc_stat_items = df_inc_stat.index
-        st.selectbox('Choose your option:', options=inc_stat_items, key='income_statement_item')
+        st.selectbox('Choose your option:', options=inc_stat_items, key=kept('income_statement_item', inc_stat_items))
         st.dataframe(df_inc_stat)
         dff = df_inc_stat.loc[st.session_state['income_statement_item']].reset_index()
         st.bar_chart(dff[st.session_state['income_statement_item']]
@@ -148,13 +207,49 @@ with tab5:
     except KeyError as e:
         pass
 
-with tab6:
-    st.expander('Estimates for the revenues').table(stock.get_revenue_estimates())
-    st.expander('Estimates for the eps').table(stock.get_earning_estimates())
-    st.expander('Change of estimates for the eps').table(stock.get_eps_trends())
+
+def show_estimates():
+    st.expander('Estimates for the revenues').table(fundamental('get_revenue_estimates'))
+    st.expander('Estimates for the eps').table(fundamental('get_earning_estimates'))
+    st.expander('Change of estimates for the eps').table(fundamental('get_eps_trends'))
+    recommendations = fundamental('get_recommendations') or {}
     st.radio('Select:',
              options=['stock_recommendations', 'stock_price_targets'],
              horizontal=True,
-             key='radio_choice')
-    st.expander('Change of recommendations').table(stock.get_recommendations()[st.session_state['radio_choice']])
-
+             key=kept('radio_choice'))
+    st.expander('Change of recommendations').table(recommendations.get(st.session_state['radio_choice']))
+
+
+def show_watchlist():
+    st.multiselect('Tickers:', TICKERS, key=kept('watchlist'))
+    st.date_input('Pick start date:', key=kept('watchlist_start_date'))
+    st.number_input('Volatility window:', min_value=2, max_value=250, step=1, key=kept('volatility_window'))
+    if not st.session_state['watchlist']:
+        return
+    universe = StockUniverse(st.session_state['watchlist'])
+    start_date = st.session_state['watchlist_start_date']
+    with phase('watchlist'):
+        summary = universe.get_summary(st.session_state['volatility_window'], start_date=start_date)
+        correlations = universe.get_correlations(start_date=start_date)
+        volatility = universe.get_volatility(st.session_state['volatility_window'], start_date=start_date)
+    st.subheader('Summary')
+    st.dataframe(summary)
+    st.subheader('Correlation of daily returns')
+    st.dataframe(correlations)
+    st.subheader('Annualized rolling volatility')
+    st.line_chart(volatility)
+
+
+# Only the selected section renders; the others wait for their data until they are opened
+sections = {'General information': show_general_information,
+            'Price history': show_price_history,
+            'Balance Sheet': show_balance_sheet,
+            'Cash Flow': show_cash_flow,
+            'Income Statement': show_income_statement,
+            'Estimates': show_estimates,
+            'Watchlist': show_watchlist}
+section = st.radio('Section:', list(sections), horizontal=True, key='section', label_visibility='collapsed')
+sections[section]()
+save_kept_widgets()
+
+st.sidebar.expander('Cache statistics').json(stock.cache_stats())
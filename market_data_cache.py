@@ -0,0 +1,151 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+# Cache location, shared by every session and server process on the machine
+DEFAULT_CACHE_PATH = os.environ.get('MARKET_DATA_CACHE_PATH', './databases/market_data_cache.db3')
+
+# Time to live in seconds per kind of data
+DEFAULT_TTLS = {
+    'quotes': 15 * 60,
+    'news': 60 * 60,
+    'info': 6 * 60 * 60,
+    'fundamentals': 24 * 60 * 60,
+}
+
+# Seconds between purges of all expired entries, run by set()
+PURGE_INTERVAL = 10 * 60
+
+# Kind of data behind every dataset stored by Stock
+DATASET_KINDS = {
+    'history': 'quotes',
+    'news': 'news',
+    'info': 'info',
+    'balance_sheet': 'fundamentals',
+    'cash_flow': 'fundamentals',
+    'income_stmt': 'fundamentals',
+    'calendar': 'fundamentals',
+    'earnings_estimate': 'fundamentals',
+    'revenue_estimate': 'fundamentals',
+    'eps_trend': 'fundamentals',
+    'recommendations_summary': 'fundamentals',
+    'analyst_price_targets': 'fundamentals',
+}
+
+
+class MarketDataCache:
+    """On-disk cache of market data with a separate TTL per kind of data.
+
+    An expired entry is deleted when it is read, and set() deletes all expired entries every
+    PURGE_INTERVAL seconds, since history keys change with every requested range.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttls: dict | None = None) -> None:
+        self.path = path
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.counters = {'hits': Counter(), 'misses': Counter(), 'expired': Counter()}
+        self.purged_at = time.time()
+        self._lock = threading.Lock()
+        if path != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS market_data ('
+                           'ticker TEXT NOT NULL, '
+                           'dataset TEXT NOT NULL, '
+                           'key TEXT NOT NULL, '
+                           'fetched_at REAL NOT NULL, '
+                           'payload BLOB NOT NULL, '
+                           'PRIMARY KEY (ticker, dataset, key))')
+        self._conn.commit()
+
+    def __repr__(self):
+        return f"MarketDataCache({self.path!r})"
+
+    def ttl(self, dataset: str) -> float:
+        return self.ttls[DATASET_KINDS.get(dataset, 'fundamentals')]
+
+    def get(self, ticker: str, dataset: str, key: str = ''):
+        """Return (found, value) for a fresh entry, counting hits, misses and expiries."""
+        with self._lock:
+            row = self._conn.execute('SELECT fetched_at, payload FROM market_data '
+                                     'WHERE ticker = ? AND dataset = ? AND key = ?',
+                                     (ticker, dataset, key)).fetchone()
+            if row is None:
+                self.counters['misses'][dataset] += 1
+                return False, None
+            fetched_at, payload = row
+            if time.time() - fetched_at > self.ttl(dataset):
+                self.counters['expired'][dataset] += 1
+                self._conn.execute('DELETE FROM market_data WHERE ticker = ? AND dataset = ? AND key = ?',
+                                   (ticker, dataset, key))
+                self._conn.commit()
+                return False, None
+            self.counters['hits'][dataset] += 1
+        return True, pickle.loads(payload)
+
+    def set(self, ticker: str, dataset: str, value, key: str = '') -> None:
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO market_data VALUES (?, ?, ?, ?, ?)',
+                               (ticker, dataset, key, time.time(), payload))
+            self._conn.commit()
+        if time.time() - self.purged_at > PURGE_INTERVAL:
+            self.purge()
+
+    def purge(self) -> int:
+        """Delete every expired entry, returning how many were deleted."""
+        now = time.time()
+        with self._lock:
+            self.purged_at = now
+            datasets = [dataset for dataset, in self._conn.execute('SELECT DISTINCT dataset FROM market_data')]
+            deleted = sum(self._conn.execute('DELETE FROM market_data WHERE dataset = ? AND fetched_at < ?',
+                                             (dataset, now - self.ttl(dataset))).rowcount
+                          for dataset in datasets)
+            self._conn.commit()
+        return deleted
+
+    def get_or_fetch(self, ticker: str, dataset: str, fetch, key: str = ''):
+        """Serve a dataset from the cache, calling fetch() and storing the result when stale."""
+        found, value = self.get(ticker, dataset, key)
+        if not found:
+            value = fetch()
+            self.set(ticker, dataset, value, key)
+        return value
+
+    def clear(self, ticker: str | None = None) -> None:
+        with self._lock:
+            if ticker is None:
+                self._conn.execute('DELETE FROM market_data')
+            else:
+                self._conn.execute('DELETE FROM market_data WHERE ticker = ?', (ticker,))
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """Hit, miss and expiry counters of this process, in total and per dataset."""
+        with self._lock:
+            return {name: {'total': sum(counter.values()), **counter}
+                    for name, counter in self.counters.items()}
+
+
+_default_cache: MarketDataCache | None = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> MarketDataCache:
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = MarketDataCache()
+        return _default_cache
+
+
+def set_default_cache(cache: MarketDataCache) -> None:
+    global _default_cache
+    with _default_cache_lock:
+        _default_cache = cache
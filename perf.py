@@ -0,0 +1,41 @@
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+# Phase timings are only collected when enabled, by the benchmark or PERF_PHASES=1
+_enabled = os.environ.get('PERF_PHASES') == '1'
+_timings: dict[str, list[float]] = defaultdict(list)
+_lock = threading.Lock()
+
+
+def enable(enabled: bool = True) -> None:
+    global _enabled
+    _enabled = enabled
+
+
+@contextmanager
+def phase(name: str):
+    """Add the wall time of the block to the timings of a named phase."""
+    if not _enabled:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        with _lock:
+            _timings[name].append(elapsed)
+
+
+def reset() -> None:
+    with _lock:
+        _timings.clear()
+
+
+def snapshot() -> dict[str, float]:
+    """Total seconds per phase since the last reset."""
+    with _lock:
+        return {name: sum(values) for name, values in _timings.items()}
@@ -0,0 +1,131 @@
+import threading
+import time
+
+import pandas as pd
+
+from indicators import IndicatorEngine
+
+
+class PriceHistory:
+    """Single price history per (ticker, interval), grown on demand and shared by all readers.
+
+    Only the missing date range is downloaded: older bars when a caller asks for an earlier
+    start, newer bars once the stored tail is older than the TTL. The stored frame only holds
+    the downloaded bars; derived columns are read from an IndicatorEngine over the closes for
+    the rows a caller asks for, so readers never see each other's columns.
+    """
+
+    def __init__(self, ticker: str, interval: str, fetch, ttl: float) -> None:
+        self.ticker = ticker
+        self.interval = interval
+        self.fetch = fetch  # fetch(start, end) -> DataFrame indexed by date, end exclusive
+        self.ttl = ttl
+        self.frame: pd.DataFrame | None = None
+        self.start: pd.Timestamp | None = None
+        self.fetched_at = 0.0
+        self.indicators = IndicatorEngine()
+        self._lock = threading.RLock()
+
+    def __repr__(self):
+        return f"PriceHistory({self.ticker!r}, {self.interval!r})"
+
+    def _timestamp(self, value) -> pd.Timestamp:
+        timestamp = pd.Timestamp(value)
+        tz = getattr(self.frame.index, 'tz', None) if self.frame is not None else None
+        if tz is not None and timestamp.tzinfo is None:
+            timestamp = timestamp.tz_localize(tz)
+        return timestamp
+
+    def _replace(self, frame: pd.DataFrame, unchanged: int = 0) -> None:
+        # The first unchanged bars are the same as in the previous frame
+        self.frame = frame
+        self.fetched_at = time.time()
+        if 'Close' in frame:
+            self.indicators.update(unchanged, frame['Close'].to_numpy()[unchanged:])
+
+    def _ensure(self, start) -> None:
+        start = pd.Timestamp(start).tz_localize(None).normalize()
+        if self.frame is None:
+            self._replace(self.fetch(start.date(), None))
+            self.start = start
+        elif start < self.start:
+            earlier = self.fetch(start.date(), self.start.date())
+            self._replace(pd.concat([earlier, self.frame]))
+            self.start = start
+        elif time.time() - self.fetched_at > self.ttl and self.frame.empty:
+            # Nothing came back last time, e.g. a failed request, so ask for everything again
+            self._replace(self.fetch(self.start.date(), None))
+        elif time.time() - self.fetched_at > self.ttl:
+            # Re-download from the last stored bar, which may have been incomplete
+            tail = self.fetch(self.frame.index[-1].date(), None)
+            if tail.empty:
+                self.fetched_at = time.time()
+            else:
+                kept = self.frame.iloc[:self.frame.index.searchsorted(tail.index[0])]
+                self._replace(pd.concat([kept, tail]), unchanged=len(kept))
+
+    def window(self, start, end=None, columns: dict | None = None) -> pd.DataFrame:
+        """Rows in [start, end), downloading what is missing.
+
+        columns maps names of derived columns to func(indicators), e.g. from moving_average();
+        they are added to a copy of the rows. Without columns the rows are a slice of the stored
+        frame, which is replaced but never changed in place.
+        """
+        with self._lock:
+            self._ensure(start)
+            frame = self.frame
+            if frame.empty:
+                return frame
+            first = frame.index.searchsorted(self._timestamp(start))
+            last = len(frame) if end is None else frame.index.searchsorted(self._timestamp(end))
+            rows = frame.iloc[first:last]
+            if columns and 'Close' in frame:
+                rows = rows.copy()
+                for name, func in columns.items():
+                    rows[name] = func(self.indicators)[first:last]
+        return rows
+
+
+# Derived columns for PriceHistory.window(), as (name, func(indicators))
+def returns(name: str = 'Volatility') -> tuple:
+    return name, IndicatorEngine.returns
+
+
+def moving_average(window: int) -> tuple:
+    return f'Ma{window}', lambda indicators: indicators.sma(window)
+
+
+def ema(span: int) -> tuple:
+    return f'Ema{span}', lambda indicators: indicators.ema(span)
+
+
+def rolling_std(window: int) -> tuple:
+    return f'Std{window}', lambda indicators: indicators.rolling_std(window)
+
+
+def drawdown(name: str = 'Drawdown') -> tuple:
+    return name, IndicatorEngine.drawdown
+
+
+# Price histories kept per process, the least recently read ones are dropped beyond this
+MAX_PRICE_HISTORIES = 64
+
+_stores: dict[tuple[str, str], PriceHistory] = {}
+_stores_lock = threading.Lock()
+
+
+def get_price_history(ticker: str, interval: str, fetch, ttl: float) -> PriceHistory:
+    with _stores_lock:
+        store = _stores.pop((ticker, interval), None)
+        if store is None:
+            while len(_stores) >= MAX_PRICE_HISTORIES:
+                _stores.pop(next(iter(_stores)))
+            store = PriceHistory(ticker, interval, fetch, ttl)
+        # Reinserted as the most recently read
+        _stores[ticker, interval] = store
+        return store
+
+
+def clear_price_histories() -> None:
+    with _stores_lock:
+        _stores.clear()
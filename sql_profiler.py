@@ -0,0 +1,116 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Statements slower than this are kept in the slow-query log with their query plan
+SLOW_QUERY_SECONDS = float(os.environ.get('SLOW_QUERY_SECONDS', '0.05'))
+SLOW_QUERY_LOG_SIZE = 100
+
+# Recorder of the statements run by the current thread, if any
+_local = threading.local()
+# Slowest statements of this process, newest last
+_slow_queries = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+
+
+class QueryRecorder:
+    """Statements this thread sends to any engine of db.get_engine() while the recorder is active.
+
+    Used as a context manager around one Streamlit rerun. Every statement is recorded with its
+    duration, as timed by db's cursor hooks, and the rows it affected, or for ORM selects the
+    rows it returned. Statements of other threads, i.e. other browser sessions, are not recorded.
+    """
+
+    def __init__(self, name: str = '') -> None:
+        self.name = name
+        self.statements: list[dict] = []
+        self.started_at: float | None = None
+        self.seconds = 0.0
+        self._previous = None
+
+    def __repr__(self):
+        return f"QueryRecorder({self.name!r}, {len(self.statements)} statements)"
+
+    def __enter__(self) -> 'QueryRecorder':
+        self._previous = getattr(_local, 'recorder', None)
+        _local.recorder = self
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.seconds = time.perf_counter() - self._started
+        _local.recorder = self._previous
+
+    def summary(self) -> dict:
+        seconds = [statement['seconds'] for statement in self.statements]
+        return {'statements': len(self.statements),
+                'db_seconds': sum(seconds),
+                'slowest_seconds': max(seconds, default=0.0),
+                'rows': sum(statement['rows'] or 0 for statement in self.statements),
+                'run_seconds': self.seconds}
+
+    def to_json(self) -> str:
+        """The run's summary, statements and the process's slow-query log, for offline profiling."""
+        return json.dumps({'name': self.name, 'started_at': self.started_at, 'summary': self.summary(),
+                           'statements': self.statements, 'slow_queries': slow_queries()}, indent=2, default=str)
+
+
+def current_recorder() -> QueryRecorder | None:
+    return getattr(_local, 'recorder', None)
+
+
+def slow_queries() -> list[dict]:
+    return list(_slow_queries)
+
+
+def clear_slow_queries() -> None:
+    _slow_queries.clear()
+
+
+def _query_plan(cursor, statement: str, parameters) -> list[str] | None:
+    try:
+        plan_cursor = cursor.connection.cursor()
+        try:
+            return [row[-1] for row in plan_cursor.execute(f'EXPLAIN QUERY PLAN {statement}', parameters)]
+        finally:
+            plan_cursor.close()
+    except (sqlite3.Error, AttributeError, TypeError):
+        return None
+
+
+def record_statement(conn, cursor, statement: str, parameters, executemany: bool, seconds: float) -> None:
+    """Report a statement timed by db's cursor hooks to the active recorder and the slow-query log."""
+    recorder = current_recorder()
+    if recorder is None and seconds < SLOW_QUERY_SECONDS:
+        return
+    entry = {'statement': statement, 'seconds': seconds, 'executemany': executemany,
+             'rows': cursor.rowcount if cursor.rowcount >= 0 else None, 'database': str(conn.engine.url)}
+    if seconds >= SLOW_QUERY_SECONDS:
+        plan = None
+        if conn.dialect.name == 'sqlite' and not executemany and statement.lstrip().upper().startswith('SELECT'):
+            plan = _query_plan(cursor, statement, parameters)
+        entry['plan'] = plan
+        _slow_queries.append({**entry, 'run': recorder.name if recorder is not None else None,
+                              'parameters': repr(parameters)[:500], 'at': time.time()})
+    if recorder is not None:
+        recorder.statements.append(entry)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _count_returned_rows(orm_execute_state):
+    # Buffers ORM selects while recording, so the rows they return can be counted; the ORM reads
+    # them all anyway on these screens. Outside a recording it returns at once.
+    recorder = current_recorder()
+    if recorder is None or not orm_execute_state.is_select:
+        return None
+    first = len(recorder.statements)
+    frozen = orm_execute_state.invoke_statement().freeze()
+    if len(recorder.statements) > first:
+        recorder.statements[first]['rows'] = len(frozen.data)
+    return frozen()
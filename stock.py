@@ -0,0 +1,235 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, CancelledError, Future, ThreadPoolExecutor, wait
+
+import pandas as pd
+
+from data_sources import DataSource, get_data_source
+from market_data_cache import MarketDataCache
+import price_history
+from price_history import PriceHistory, get_price_history
+
+
+# Getters of Stock.prefetch(), all of them independent I/O-bound requests
+FUNDAMENTALS = ('get_balance', 'get_cashflow', 'get_income_statement', 'get_calendar',
+                'get_earning_estimates', 'get_revenue_estimates', 'get_eps_trends', 'get_recommendations')
+PREFETCH_WORKERS = 4
+# Seconds a prefetched call may run, counted from when it starts, and may wait for a free worker
+PREFETCH_TIMEOUT = 20.0
+PREFETCH_QUEUE_TIMEOUT = 60.0
+# Seconds between checks whether a queued call has started
+PREFETCH_POLL = 0.25
+
+_executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix='stock-prefetch')
+
+# Ticker metadata of this process, (loaded_at, info) per ticker
+_info: dict[str, tuple[float, dict]] = {}
+
+
+class Prefetch:
+    """Results of getters started concurrently by Stock.prefetch(), readable as they complete.
+
+    Every call has its own deadline of timeout seconds counted from when it starts running, so
+    calls waiting behind other sessions' work in the shared pool are not timed out before they
+    run. A call still queued after queue_timeout seconds is cancelled. A call that fails or misses
+    its deadline is reported in errors and read as the default, without holding up the others,
+    and retry() runs only that call again.
+    """
+
+    def __init__(self, calls: dict, timeout: float, queue_timeout: float = PREFETCH_QUEUE_TIMEOUT,
+                 executor: ThreadPoolExecutor | None = None) -> None:
+        self.calls = calls
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+        self.executor = executor or _executor
+        self.futures: dict[str, Future] = {}
+        self.errors: dict[str, BaseException] = {}
+        self._submitted: dict[str, float] = {}
+        self._started: dict[str, float] = {}
+        for name in calls:
+            self._submit(name)
+
+    def __repr__(self):
+        done = sum(future.done() for future in self.futures.values())
+        return f"Prefetch({done}/{len(self.futures)} done)"
+
+    def _submit(self, name: str) -> None:
+        def run():
+            self._started[name] = time.monotonic()
+            return self.calls[name]()
+
+        self._started.pop(name, None)
+        self._submitted[name] = time.monotonic()
+        self.futures[name] = self.executor.submit(run)
+
+    def _remaining(self, name: str) -> float:
+        """Seconds left to wait for a call: until its deadline once started, else until it may start."""
+        started = self._started.get(name)
+        if started is None:
+            return max(0.0, self._submitted[name] + self.queue_timeout - time.monotonic())
+        return max(0.0, started + self.timeout - time.monotonic())
+
+    def _wait(self, name: str):
+        future = self.futures[name]
+        while True:
+            # A queued call is polled, so its own deadline applies as soon as it starts
+            timeout = self._remaining(name) if name in self._started else min(self._remaining(name), PREFETCH_POLL)
+            try:
+                return future.result(timeout=timeout)
+            except TimeoutError:
+                if self._remaining(name) == 0.0:
+                    raise
+
+    def get(self, name: str, default=None):
+        try:
+            return self._wait(name)
+        except Exception as e:
+            self.futures[name].cancel()
+            self.errors[name] = e
+            return default
+
+    def retry(self, name: str) -> None:
+        """Run a failed or late call again on the next read, leaving the other calls alone."""
+        self.errors.pop(name, None)
+        if self.futures[name].done():
+            self._submit(name)
+        else:
+            # Still running, it gets a new deadline instead of a second request
+            self._started[name] = time.monotonic()
+
+    def as_completed(self):
+        """Yield (name, result) pairs in completion order, skipping failed and late calls."""
+        pending = {future: name for name, future in self.futures.items()}
+        while pending:
+            done, _ = wait(pending, timeout=min(PREFETCH_POLL, *(self._remaining(name) for name in pending.values())),
+                           return_when=FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                if future.cancelled():
+                    self.errors[name] = CancelledError(name)
+                elif future.exception() is None:
+                    yield name, future.result()
+                else:
+                    self.errors[name] = future.exception()
+            for future, name in list(pending.items()):
+                if self._remaining(name) == 0.0 and (name in self._started or future.cancel()):
+                    self.errors[name] = TimeoutError(f"{name} did not finish in time")
+                    del pending[future]
+
+    def result(self, default=None) -> dict:
+        return {name: self.get(name, default) for name in self.futures}
+
+
+class Stock:
+    def __init__(self, ticker: str = 'CAT', cache: MarketDataCache | None = None, metadata: bool = True,
+                 source: DataSource | None = None) -> None:
+        # Nothing is requested here; without metadata, info is never requested at all
+        self.symbol = ticker
+        self.source = source or get_data_source()
+        self.cache = cache or self.source.get_cache()
+        self.metadata = metadata
+
+    def __repr__(self):
+        return f"{self.symbol}"
+
+    def _cached(self, dataset: str):
+        # Every dataset is a yfinance Ticker attribute of the same name
+        return self.cache.get_or_fetch(self.symbol, dataset, lambda: self.source.dataset(self.symbol, dataset))
+
+    @property
+    def info(self) -> dict:
+        """Ticker metadata, loaded on first access and kept per ticker; empty without metadata."""
+        if not self.metadata:
+            return {}
+        loaded_at, info = _info.get(self.symbol, (0.0, None))
+        if info is None or time.time() - loaded_at > self.cache.ttl('info'):
+            info = self._cached('info')
+            _info[self.symbol] = (time.time(), info)
+        return info
+
+    @property
+    def industry(self):
+        return self.info.get('sectorKey')
+
+    def get_info(self):
+        stock_info = self.info["longBusinessSummary"]
+        return stock_info
+
+    def get_news(self):
+        stock_news_list = list()
+        stock_news = self._cached('news')
+        for i, value in enumerate(stock_news):
+            stock_news_list.append({'title': value['title'], 'link': value['link']})
+        stock_news = pd.DataFrame(stock_news_list)
+        return stock_news
+
+    def _history(self, start_date, end_date, interval='1d'):
+        return self.cache.get_or_fetch(self.symbol, 'history',
+                                       lambda: self.source.history(self.symbol, start=start_date, end=end_date,
+                                                                   interval=interval),
+                                       key=f"{interval}:{start_date}:{end_date}")
+
+    def get_price_history(self, interval: str = '1d') -> PriceHistory:
+        return get_price_history(self.symbol, interval,
+                                 lambda start, end: self._history(start, end, interval),
+                                 self.cache.ttl('history'))
+
+    def get_quotes(self, start_date: str = '2022-01-01', end_date=None, interval: str = '1d',
+                   moving_average: int | None = None):
+        columns = dict([price_history.moving_average(moving_average)]) if moving_average else None
+        stock_history = self.get_price_history(interval).window(start_date, end_date, columns)
+        return stock_history
+
+    def get_volatility(self, start_date: str = '2022-01-01', end_date=None, interval: str = '1d'):
+        stock_volatility = self.get_price_history(interval).window(start_date, end_date,
+                                                                   dict([price_history.returns('Volatility')]))
+        return stock_volatility
+
+    def get_moving_average(self, window: int) -> str:
+        """Name of the moving average column that get_quotes(moving_average=window) returns."""
+        return price_history.moving_average(window)[0]
+
+    def get_balance(self):
+        stock_balance = self._cached('balance_sheet')
+        return stock_balance
+
+    def get_cashflow(self):
+        stock_cashflow = self._cached('cash_flow')
+        return stock_cashflow
+
+    def get_income_statement(self):
+        stock_income_statement = self._cached('income_stmt')
+        return stock_income_statement
+
+    def get_calendar(self):
+        stock_calendar = self._cached('calendar')
+        return stock_calendar
+
+    def get_earning_estimates(self):
+        stock_earning_estimates = self._cached('earnings_estimate')
+        return stock_earning_estimates
+
+    def get_revenue_estimates(self):
+        stock_revenue_estimates = self._cached('revenue_estimate')
+        return stock_revenue_estimates
+
+    def get_eps_trends(self):
+        stock_eps_estimates_trends = self._cached('eps_trend')
+        return stock_eps_estimates_trends
+
+    def get_recommendations(self) -> dict:
+        stock_recommendations = self._cached('recommendations_summary')
+        stock_price_targets = self._cached('analyst_price_targets')
+        recommendations = {'stock_recommendations': stock_recommendations,
+                           'stock_price_targets': stock_price_targets}
+        return recommendations
+
+    def prefetch(self, getters: tuple[str, ...] = FUNDAMENTALS, timeout: float = PREFETCH_TIMEOUT) -> Prefetch:
+        """Start the given getters at the same time on the shared bounded thread pool."""
+        return Prefetch({name: getattr(self, name) for name in getters}, timeout)
+
+    def cache_stats(self) -> dict:
+        return self.cache.stats()
+
+
+def clear_info() -> None:
+    _info.clear()
@@ -1,5 +1,5 @@
 import streamlit as st
-import yfinance as yf
+from data_sources import get_data_source
 from smtplib import SMTP_SSL as SMTP
 from email.mime.text import MIMEText
 from streamlit_login_auth_ui.widgets import __login__
@@ -42,8 +42,7 @@ def main():
 
             ticker = st.text_input("Enter Stock Ticker (e.g., AAPL, GOOGL)", "AAPL")
             if ticker:
-                stock_data = yf.Ticker(ticker)
-                history = stock_data.history(period="1y")
+                history = get_data_source().history(ticker, period="1y")
 
                 st.line_chart(history.Close)
         else:
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+from data_sources import DataSource, get_data_source
+from market_data_cache import MarketDataCache
+from stock import Stock
+
+# Tickers per yfinance download request
+BATCH_SIZE = 50
+TRADING_DAYS = 252
+
+
+class StockUniverse:
+    """Many tickers analysed together on one wide frame per price field, one column per ticker.
+
+    Histories are downloaded in batched requests and aligned on a common date index, so every
+    analytic below runs column-wise over the whole universe at once instead of per Stock.
+    """
+
+    def __init__(self, tickers, cache: MarketDataCache | None = None, batch_size: int = BATCH_SIZE,
+                 source: DataSource | None = None) -> None:
+        self.tickers = list(dict.fromkeys(tickers))
+        self.source = source or get_data_source()
+        self.cache = cache or self.source.get_cache()
+        self.batch_size = batch_size
+        self._stocks: dict[str, Stock] = {}
+        self._prices: dict[tuple, pd.DataFrame] = {}
+
+    def __repr__(self):
+        return f"StockUniverse({len(self.tickers)} tickers)"
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def __getitem__(self, ticker: str) -> Stock:
+        if ticker not in self._stocks:
+            self._stocks[ticker] = Stock(ticker, cache=self.cache, metadata=False, source=self.source)
+        return self._stocks[ticker]
+
+    def _download(self, batch: list[str], start_date, end_date, interval: str) -> pd.DataFrame:
+        return self.cache.get_or_fetch(','.join(batch), 'history',
+                                       lambda: self.source.download(batch, start=start_date, end=end_date,
+                                                                    interval=interval),
+                                       key=f"{interval}:{start_date}:{end_date}")
+
+    def get_prices(self, field: str = 'Close', start_date: str = '2022-01-01', end_date=None,
+                   interval: str = '1d', fill: bool = True) -> pd.DataFrame:
+        """Wide float64 frame of one price field, dates by tickers.
+
+        With fill, gaps from exchange holidays are carried forward so that listings on
+        different markets line up.
+        """
+        key = (field, str(start_date), str(end_date), interval, fill)
+        if key in self._prices:
+            return self._prices[key]
+        batches = [self.tickers[i:i + self.batch_size] for i in range(0, len(self.tickers), self.batch_size)]
+        frames = [self._download(batch, start_date, end_date, interval)[field] for batch in batches]
+        prices = pd.concat(frames, axis=1).reindex(columns=self.tickers).sort_index().astype(np.float64)
+        self._prices[key] = prices.ffill() if fill else prices
+        return self._prices[key]
+
+    def get_returns(self, start_date: str = '2022-01-01', end_date=None, interval: str = '1d') -> pd.DataFrame:
+        """Returns of every ticker on its own trading days, NaN on the days its market was closed.
+
+        A return after a holiday is taken from the last close before it, so filled prices never
+        add zero returns that would bias volatility and correlation down.
+        """
+        prices = self.get_prices('Close', start_date, end_date, interval, fill=False)
+        values = prices.to_numpy()
+        previous = prices.ffill().to_numpy()
+        returns = np.full_like(values, np.nan)
+        returns[1:] = values[1:] / previous[:-1] - 1
+        return pd.DataFrame(returns, index=prices.index, columns=prices.columns)
+
+    def get_volatility(self, window: int = 21, start_date: str = '2022-01-01', end_date=None,
+                       interval: str = '1d', annualize: bool = True) -> pd.DataFrame:
+        """Rolling standard deviation of returns over each ticker's last window trading days."""
+        returns = self.get_returns(start_date, end_date, interval)
+        values = returns.to_numpy()
+        valid = ~np.isnan(values)
+        # Returns seen so far per ticker, the window spans these rather than rows of the frame
+        count = valid.cumsum(axis=0)
+        sums = _trailing_sums(values, valid, count, window)
+        squares = _trailing_sums(values ** 2, valid, count, window)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            variance = (squares - sums ** 2 / window) / (window - 1)
+        volatility = pd.DataFrame(np.sqrt(np.maximum(variance, 0)), index=returns.index,
+                                  columns=returns.columns)
+        return volatility * np.sqrt(TRADING_DAYS) if annualize else volatility
+
+    def get_correlations(self, start_date: str = '2022-01-01', end_date=None, interval: str = '1d',
+                         min_periods: int = 20) -> pd.DataFrame:
+        return self.get_returns(start_date, end_date, interval).corr(min_periods=min_periods)
+
+    def get_moving_averages(self, window: int, start_date: str = '2022-01-01', end_date=None,
+                            interval: str = '1d') -> pd.DataFrame:
+        return self.get_prices('Close', start_date, end_date, interval).rolling(window).mean()
+
+    def get_summary(self, window: int = 21, start_date: str = '2022-01-01', end_date=None,
+                    interval: str = '1d') -> pd.DataFrame:
+        """Latest close, total return and rolling volatility per ticker."""
+        prices = self.get_prices('Close', start_date, end_date, interval)
+        first_valid = prices.bfill().iloc[0]
+        # Tickers whose market was closed on the last date keep their last volatility
+        volatility = self.get_volatility(window, start_date, end_date, interval).ffill()
+        return pd.DataFrame({'Close': prices.iloc[-1],
+                             'Return': prices.iloc[-1] / first_valid - 1,
+                             'Volatility': volatility.iloc[-1]})
+
+
+def _trailing_sums(values: np.ndarray, valid: np.ndarray, count: np.ndarray, window: int) -> np.ndarray:
+    """Sum of each column's last window valid values at every valid row, NaN elsewhere.
+
+    Differences of cumulative sums, looked up by how many values of the column came before, so
+    the whole frame is summed in a few array operations instead of one rolling pass per column.
+    """
+    totals = np.where(valid, values, 0.0).cumsum(axis=0)
+    # Sum of the first k valid values of every column at row k
+    by_count = np.zeros((len(values) + 1, values.shape[1]))
+    rows, columns = np.nonzero(valid)
+    by_count[count[rows, columns], columns] = totals[rows, columns]
+    sums = totals - by_count[np.maximum(count - window, 0), np.arange(values.shape[1])]
+    return np.where(valid & (count >= window), sums, np.nan)
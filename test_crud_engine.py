@@ -0,0 +1,44 @@
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from crud_models import Country, Currency
+from crud_engine import get_session_factory
+from crud_lookups import clear_searches
+from crud_pagination import clear_counts
+from data_access import DataAccess
+from db import dispose_engines
+
+
+def countries_app():
+    from crud_engine import run_app
+
+    run_app(["countries"])
+
+
+@pytest.fixture
+def countries(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with get_session_factory("countries")() as session:
+        DataAccess.add_item(session, Country, id=1, name="Austria", code="AT")
+        DataAccess.add_item(session, Country, id=2, name="Poland", code="PL")
+        DataAccess.add_item(session, Currency, id=1, country_id=1, name="Euro", symbol="EUR")
+        DataAccess.add_item(session, Currency, id=2, country_id=2, name="Zloty", symbol="PLN")
+    yield get_session_factory("countries")
+    clear_counts()
+    clear_searches()
+    dispose_engines()
+
+
+def test_update_keeps_foreign_key_when_untouched(countries):
+    app = AppTest.from_function(countries_app, default_timeout=30).run()
+    app.sidebar.selectbox[0].select(Currency).run()
+    app.sidebar.selectbox[1].select("Update").run()
+    app.selectbox(key="countries_currencies_update").select("Zloty").run()
+    assert app.selectbox(key="countries_currencies_update_country_id_2").value == "Poland"
+
+    next(button for button in app.button if button.label == "Update Currency").click().run()
+
+    assert not app.exception
+    assert app.success[0].value == "Currency updated successfully"
+    with countries() as session:
+        assert DataAccess.get_item(session, Currency, 2).country_id == 2
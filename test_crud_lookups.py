@@ -0,0 +1,39 @@
+import pytest
+
+from crud_engine import get_session_factory
+from crud_lookups import clear_searches, search_lookup
+from crud_models import Country
+from data_access import DataAccess
+from db import dispose_engines
+
+
+@pytest.fixture
+def countries(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with get_session_factory("countries")() as session:
+        DataAccess.add_item(session, Country, id=1, name="Austria", code="AT")
+        DataAccess.add_item(session, Country, id=2, name="Poland", code="PL")
+    yield get_session_factory("countries")
+    clear_searches()
+    dispose_engines()
+
+
+def search(session, text=""):
+    return search_lookup(session, Country.name, Country.id, text)
+
+
+def test_search_is_cached_until_a_commit_changes_the_table(countries):
+    with countries() as session:
+        assert search(session, "P") == {"Poland": 2}
+        session.execute(Country.__table__.insert().values(id=3, name="Portugal", code="PT"))
+        assert search(session, "P") == {"Poland": 2}
+        session.rollback()
+
+        DataAccess.add_item(session, Country, id=3, name="Portugal", code="PT")
+        assert search(session, "P") == {"Poland": 2, "Portugal": 3}
+
+        DataAccess.update_item(session, Country, 2, name="Polska")
+        assert search(session, "P") == {"Polska": 2, "Portugal": 3}
+
+        DataAccess.delete_item(session, Country, 3)
+        assert search(session) == {"Austria": 1, "Polska": 2}
@@ -0,0 +1,59 @@
+from datetime import date
+
+import pytest
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+import currency_backfill
+from currency_backfill import BackfillJob
+from currency_store import create_schema, create_store_engine, sync_currency_data
+from db import dispose_engines
+from test_currency_store import fake_history
+
+TASKS = [('EURUSD=X', date(2021, 1, 1), date(2022, 1, 1)), ('GBPUSD=X', date(2021, 1, 1), date(2022, 1, 1)),
+         ('BROKEN=X', date(2021, 1, 1), date(2022, 1, 1))]
+
+
+def fetch(currency, start_date, end_date):
+    if currency == 'BROKEN=X':
+        raise ValueError('no data')
+    return fake_history(currency, start_date, end_date)
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(currency_backfill, 'fetch_currency_data', fetch)
+    engine = create_store_engine(f"sqlite:///{tmp_path / 'prices.db'}")
+    create_schema(engine)
+    yield engine
+    dispose_engines()
+
+
+def test_backfill_saves_missing_days_and_reports_failed_pairs(engine, monkeypatch):
+    monkeypatch.setattr('currency_store.fetch_currency_data', fetch)
+    with Session(engine) as session:
+        sync_currency_data(session, 'EURUSD=X', date(2021, 1, 1), date(2021, 7, 1))
+
+    job = BackfillJob(TASKS, engine, rate=1000).start()
+
+    assert job.wait(timeout=30)
+    progress = job.progress()
+    assert progress['saved'] == 2 and list(progress['failed']) == ['BROKEN=X']
+    # The last stored day, 2021-06-30, is downloaded again
+    assert progress['rows'] == len(fake_history(None, '2021-06-30', '2022-01-01')) + len(
+        fake_history(None, '2021-01-01', '2022-01-01'))
+    assert progress['fraction'] == 1.0 and progress['error'] is None
+
+
+def test_backfill_stops_when_the_writer_dies(engine, monkeypatch):
+    class LockedSession(Session):
+        def commit(self):
+            raise OperationalError('COMMIT', {}, Exception('database is locked'))
+
+    monkeypatch.setattr(currency_backfill, 'Session', LockedSession)
+
+    job = BackfillJob(TASKS * 10, engine, workers=2, rate=1000).start()
+
+    assert job.wait(timeout=30)
+    assert 'database is locked' in job.error
+    assert job.saved == 0 and set(job.failed) == {'EURUSD=X', 'GBPUSD=X', 'BROKEN=X'}
@@ -0,0 +1,49 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+import currency_store
+from currency_store import CurrencyPrice, create_schema, create_store_engine, missing_ranges, sync_currency_data
+from db import dispose_engines
+
+
+def fake_history(currency, start_date, end_date):
+    index = pd.bdate_range(start_date, end_date, inclusive='left')
+    prices = np.linspace(1.0, 2.0, len(index))
+    return pd.DataFrame({'Open': prices, 'High': prices, 'Low': prices, 'Close': prices, 'Volume': 0.0}, index=index)
+
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    monkeypatch.setattr(currency_store, 'fetch_currency_data', fake_history)
+    engine = create_store_engine(f"sqlite:///{tmp_path / 'prices.db'}")
+    create_schema(engine)
+    with Session(engine) as session:
+        yield session
+    dispose_engines()
+
+
+def stored_days(session, start_date, end_date) -> int:
+    return session.scalar(select(func.count()).where(CurrencyPrice.currency == 'EURUSD=X',
+                                                     CurrencyPrice.date >= start_date,
+                                                     CurrencyPrice.date < end_date))
+
+
+def test_sync_fills_a_gap_between_synced_years(session):
+    sync_currency_data(session, 'EURUSD=X', date(2021, 1, 1), date(2022, 1, 1))
+    sync_currency_data(session, 'EURUSD=X', date(2023, 1, 1), date(2024, 1, 1))
+
+    assert sync_currency_data(session, 'EURUSD=X', date(2022, 1, 1), date(2023, 1, 1)) > 0
+    assert stored_days(session, date(2022, 1, 1), date(2023, 1, 1)) == len(pd.bdate_range('2022-01-01', '2022-12-31'))
+
+
+def test_holidays_are_not_downloaded_again(session):
+    sync_currency_data(session, 'EURUSD=X', date(2021, 1, 1), date(2022, 1, 1))
+    session.execute(CurrencyPrice.__table__.delete().where(CurrencyPrice.date.in_([date(2021, 12, 24),
+                                                                                   date(2021, 12, 27)])))
+
+    assert missing_ranges(session, 'EURUSD=X', date(2021, 1, 1), date(2021, 12, 31)) == []
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from indicators import MAX_INDICATORS, IndicatorEngine
+
+
+def indicators(engine: IndicatorEngine) -> dict:
+    return {'sma': engine.sma(5), 'std': engine.rolling_std(5), 'ema': engine.ema(10),
+            'returns': engine.returns(), 'drawdown': engine.drawdown()}
+
+
+def test_incremental_updates_match_a_full_computation():
+    close = 100 + np.random.default_rng(0).normal(0, 1, 60).cumsum()
+    engine = IndicatorEngine(close[:40])
+    indicators(engine)
+
+    engine.append(close[40:50])
+    # The last bar is replaced, as a refreshed intraday bar would be
+    engine.update(49, close[49:])
+
+    series = pd.Series(close)
+    expected = {'sma': series.rolling(5).mean(), 'std': series.rolling(5).std(),
+                'ema': series.ewm(span=10, adjust=False).mean(), 'returns': series.pct_change(),
+                'drawdown': series / series.cummax() - 1}
+    for kind, values in indicators(engine).items():
+        np.testing.assert_allclose(values, expected[kind], rtol=1e-9, err_msg=kind)
+
+
+def test_least_recently_read_indicators_are_dropped():
+    engine = IndicatorEngine(np.arange(1.0, 31.0))
+    engine.drawdown()
+    for window in range(2, MAX_INDICATORS + 2):
+        engine.sma(window)
+
+    assert len(engine._indicators) == MAX_INDICATORS
+    assert ('peak', 0) not in engine._indicators and ('drawdown', 0) not in engine._indicators
+    np.testing.assert_allclose(engine.drawdown(), np.zeros(30))
@@ -0,0 +1,36 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from market_data_cache import MarketDataCache
+
+
+def entries(cache: MarketDataCache) -> int:
+    return cache._conn.execute('SELECT COUNT(*) FROM market_data').fetchone()[0]
+
+
+def test_expired_entry_is_deleted_when_read():
+    cache = MarketDataCache(':memory:', ttls={'quotes': 0})
+    cache.set('AAPL', 'history', 'frame', key='1d:2024-01-01:None')
+    time.sleep(0.01)
+
+    assert cache.get('AAPL', 'history', key='1d:2024-01-01:None') == (False, None)
+    assert entries(cache) == 0
+
+
+def test_purge_deletes_only_expired_entries():
+    cache = MarketDataCache(':memory:', ttls={'quotes': 0})
+    for start in ('2024-01-01', '2024-02-01'):
+        cache.set('AAPL', 'history', 'frame', key=f'1d:{start}:None')
+    cache.set('AAPL', 'balance_sheet', 'frame')
+    time.sleep(0.01)
+
+    assert cache.purge() == 2
+    assert cache.get('AAPL', 'balance_sheet') == (True, 'frame')
+
+
+def test_counters_from_many_threads():
+    cache = MarketDataCache(':memory:')
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: cache.get('AAPL', 'news'), range(2000)))
+
+    assert cache.stats()['misses']['news'] == 2000
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from price_history import PriceHistory, moving_average, returns
+
+
+def history(start, end=None):
+    index = pd.date_range(start, end or '2024-03-01', freq='D', inclusive='left')
+    close = np.arange(1.0, len(index) + 1)
+    return pd.DataFrame({'Open': close, 'Close': close, 'Volume': 1.0}, index=index)
+
+
+def test_derived_columns_stay_out_of_the_stored_frame():
+    prices = PriceHistory('X', '1d', history, ttl=3600)
+
+    with_average = prices.window('2024-01-10', columns=dict([moving_average(20)]))
+    with_returns = prices.window('2024-01-10', columns=dict([returns()]))
+
+    assert list(prices.frame.columns) == ['Open', 'Close', 'Volume']
+    assert list(with_average.columns) == ['Open', 'Close', 'Volume', 'Ma20']
+    assert list(with_returns.columns) == ['Open', 'Close', 'Volume', 'Volatility']
+    expected = prices.frame['Close'].rolling(20).mean().loc['2024-01-10':]
+    np.testing.assert_allclose(with_average['Ma20'].to_numpy(), expected.to_numpy())
+
+
+def test_empty_download_is_requested_again_after_the_ttl():
+    calls = []
+
+    def fetch(start, end):
+        calls.append(start)
+        return history(start, end).iloc[:0] if len(calls) == 1 else history(start, end)
+
+    prices = PriceHistory('X', '1d', fetch, ttl=0)
+
+    assert prices.window('2024-01-01').empty
+    assert len(prices.window('2024-01-01')) == 60
+    assert len(calls) == 2
@@ -0,0 +1,47 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from stock import Prefetch
+
+
+def sleeper(seconds: float, value):
+    def call():
+        time.sleep(seconds)
+        return value
+    return call
+
+
+def test_queued_call_is_timed_from_its_start():
+    # One worker: 'second' waits 0.3s behind 'first' but runs within its own 0.25s deadline
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        prefetch = Prefetch({'first': sleeper(0.3, 1), 'second': sleeper(0.1, 2)}, timeout=0.25,
+                            queue_timeout=5, executor=pool)
+
+        assert prefetch.get('second') == 2
+        assert 'second' not in prefetch.errors
+
+
+def test_retry_runs_only_the_failed_call():
+    calls = []
+
+    def flaky():
+        calls.append('flaky')
+        if len(calls) == 1:
+            raise RuntimeError('boom')
+        return 'ok'
+
+    def steady():
+        calls.append('steady')
+        return 'steady'
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        prefetch = Prefetch({'flaky': flaky, 'steady': steady}, timeout=5, executor=pool)
+        assert prefetch.get('flaky') is None
+        assert isinstance(prefetch.errors['flaky'], RuntimeError)
+
+        prefetch.retry('flaky')
+
+        assert prefetch.get('flaky') == 'ok'
+        assert prefetch.get('steady') == 'steady'
+        assert prefetch.errors == {}
+        assert sorted(calls) == ['flaky', 'flaky', 'steady']
@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+
+from market_data_cache import MarketDataCache
+from stock_universe import TRADING_DAYS, StockUniverse
+
+
+def test_volatility_runs_over_each_tickers_trading_days(monkeypatch):
+    dates = pd.bdate_range('2023-01-02', periods=300)
+    returns = pd.DataFrame(np.random.default_rng(0).normal(0, 0.01, (300, 3)), index=dates,
+                           columns=['AAPL', 'SAP.DE', 'EMPTY'])
+    returns.iloc[0] = np.nan
+    returns.iloc[::7, 1] = np.nan
+    returns['EMPTY'] = np.nan
+    universe = StockUniverse(['AAPL', 'SAP.DE', 'EMPTY'], cache=MarketDataCache(':memory:'), source=object())
+    monkeypatch.setattr(universe, 'get_returns', lambda *args: returns)
+
+    volatility = universe.get_volatility(window=21)
+
+    expected = returns.apply(lambda column: column.dropna().rolling(21).std()).reindex(returns.index)
+    expected *= np.sqrt(TRADING_DAYS)
+    pd.testing.assert_frame_equal(volatility, expected, rtol=1e-9)